@@ -1,4 +1,3 @@
-
 from toga import (
     App, Window, Box, ImageView, Label
 )
@@ -7,7 +6,7 @@ from toga.colors import GRAY, YELLOW
 from toga.style.pack import Pack
 from toga.constants import RIGHT, BOLD, COLUMN, ROW, LEFT
 
-from .resources import BTCZSetup, Utils
+from .resources import BTCZSetup, Utils, Client
 
 class BitcoinZGUI(Window):
     def __init__(self):
@@ -112,6 +111,15 @@ class BitcoinZWallet(App):
         self.main_window.show()
 
 
+    def exit(self):
+        self.loop.create_task(self.close_and_exit())
+
+
+    async def close_and_exit(self):
+        await Client.close()
+        super().exit()
+
+
 def main():
     app = BitcoinZWallet(
         icon="images/BitcoinZ",
@@ -1,4 +1,4 @@
 from .objectz import (
     Gtk, Gdk, Gio, ClipBoard, StatusBar, is_wsl, NotifyGtk, StatusIconGtk,
-    Toolbar, Command, CheckCommand, Menu
+    Toolbar, Command, CheckCommand, Menu, ListModel, TableView
 )
\ No newline at end of file
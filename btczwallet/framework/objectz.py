@@ -8,7 +8,7 @@ from typing import Optional, Callable
 
 import gi
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, Gdk, Gio, GdkPixbuf
+from gi.repository import Gtk, Gdk, Gio, GdkPixbuf, GObject
 
 
 def get_app_path():
@@ -255,6 +255,146 @@ class CheckCommand(Gtk.CheckMenuItem):
 
 
 
+class ListModel(GObject.Object, Gtk.TreeModel):
+    """
+    Flat tree model over a python list of row tuples.
+    Values are read from the rows only when the view asks for them,
+    through the formatter registered for their row index if there is one.
+    """
+    def __init__(self, columns:list, formatters:Optional[dict] = None):
+        super().__init__()
+
+        self.columns = columns
+        self.formatters = formatters or {}
+        self.rows = []
+
+    def _iter(self, index):
+        tree_iter = Gtk.TreeIter()
+        tree_iter.user_data = index + 1
+        return tree_iter
+
+    def _index(self, tree_iter):
+        return tree_iter.user_data - 1
+
+    def do_get_flags(self):
+        return Gtk.TreeModelFlags.LIST_ONLY
+
+    def do_get_n_columns(self):
+        return len(self.columns)
+
+    def do_get_column_type(self, column):
+        return str
+
+    def do_get_iter(self, path):
+        index = path.get_indices()[0]
+        if index < len(self.rows):
+            return (True, self._iter(index))
+        return (False, None)
+
+    def do_iter_next(self, tree_iter):
+        index = self._index(tree_iter) + 1
+        if index < len(self.rows):
+            tree_iter.user_data = index + 1
+            return (True, tree_iter)
+        return (False, None)
+
+    def do_get_path(self, tree_iter):
+        return Gtk.TreePath([self._index(tree_iter)])
+
+    def do_get_value(self, tree_iter, column):
+        index = self.columns[column]
+        value = self.rows[self._index(tree_iter)][index]
+        if value is None:
+            return ""
+        formatter = self.formatters.get(index)
+        if formatter:
+            return formatter(value)
+        return str(value)
+
+    def do_iter_has_child(self, tree_iter):
+        return False
+
+    def do_iter_children(self, parent):
+        if parent is None and self.rows:
+            return (True, self._iter(0))
+        return (False, None)
+
+    def do_iter_n_children(self, tree_iter):
+        if tree_iter is None:
+            return len(self.rows)
+        return 0
+
+    def do_iter_nth_child(self, parent, index):
+        if parent is None and index < len(self.rows):
+            return (True, self._iter(index))
+        return (False, None)
+
+    def do_iter_parent(self, child):
+        return (False, None)
+
+    def insert(self, index, row):
+        self.rows.insert(index, row)
+        self.row_inserted(Gtk.TreePath([index]), self._iter(index))
+
+    def extend(self, rows):
+        start = len(self.rows)
+        self.rows.extend(rows)
+        for index in range(start, len(self.rows)):
+            self.row_inserted(Gtk.TreePath([index]), self._iter(index))
+
+    def update(self, index, row):
+        self.rows[index] = row
+        self.row_changed(Gtk.TreePath([index]), self._iter(index))
+
+    def remove(self, index):
+        del self.rows[index]
+        self.row_deleted(Gtk.TreePath([index]))
+
+
+
+class TableView(Gtk.ScrolledWindow):
+    def __init__(self, headings:list, columns:list, formatters:Optional[dict] = None):
+        super().__init__()
+
+        self.model = ListModel(columns, formatters)
+        self.treeview = Gtk.TreeView(model=self.model)
+        for index, heading in enumerate(headings):
+            renderer = Gtk.CellRendererText(weight=700)
+            column = Gtk.TreeViewColumn(heading, renderer, text=index)
+            column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
+            column.set_resizable(True)
+            column.set_expand(True)
+            self.treeview.append_column(column)
+        self.treeview.set_fixed_height_mode(True)
+        self.add(self.treeview)
+        self.show_all()
+
+    @property
+    def rows(self):
+        return self.model.rows
+
+    @rows.setter
+    def rows(self, rows):
+        self.treeview.set_model(None)
+        self.model.rows = rows
+        self.treeview.set_model(self.model)
+
+    def visible_rows(self):
+        visible_range = self.treeview.get_visible_range()
+        if not visible_range:
+            return []
+        start, end = visible_range
+        return self.model.rows[start.get_indices()[0]:end.get_indices()[0] + 1]
+
+    @property
+    def selection(self):
+        model, tree_iter = self.treeview.get_selection().get_selected()
+        if tree_iter is None:
+            return None
+        return self.model.rows[model.get_path(tree_iter).get_indices()[0]]
+
+
+
 class StatusBar(Gtk.Statusbar):
     def __init__(self):
         super().__init__()
@@ -1,203 +1,397 @@
-
 import asyncio
-import subprocess
 import json
 import binascii
 import os
+import time
+import aiohttp
+from collections import OrderedDict
 
 from toga import App
 
+RPC_HOST = "127.0.0.1"
+RPC_PORT = 1979
+
+MUTATING_METHODS = {
+    "stop", "addnode", "disconnectnode", "getnewaddress", "z_getnewaddress",
+    "sendtoaddress", "z_sendmany", "z_getoperationresult", "z_exportwallet",
+    "z_importwallet", "importprivkey", "z_importkey"
+}
+
+CACHE_TTL = {
+    "getdeprecationinfo": 600,
+    "getnetworksolps": 150,
+    "listaddresses": 150,
+    "z_listaddresses": 150,
+    "validateaddress": 600,
+    "z_validateaddress": 600,
+    "getinfo": 30
+}
+CACHE_SIZE = 256
+
+
 class Client():
-    def __init__(self, app:App):
+    _session = None
+    _connection = None
+    _request_id = 0
+    _inflight = {}
+    _cache = OrderedDict()
+    _block_height = None
+    coalesced_calls = 0
+    cache_ttl = dict(CACHE_TTL)
+    cache_size = CACHE_SIZE
+
+    def __init__(self, app:App, parsed:bool = True):
         super().__init__()
 
         self.app = app
+        self.parsed = parsed
         self.app_data = self.app.paths.data
-        self.bitcoinz_cli_file = os.path.join(self.app_data, "bitcoinz-cli")
+        self.bitcoinz_path = os.path.expanduser("~/.bitcoinz")
+        self.config_path = os.path.join(self.bitcoinz_path, "bitcoinz.conf")
 
-    async def _run_command(self, command):
-        try:
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+
+    def _read_config(self):
+        if not os.path.exists(self.config_path):
+            return None
+        settings = {}
+        with open(self.config_path, 'r') as config:
+            for line in config:
+                line = line.split('#', 1)[0].strip()
+                if "=" in line:
+                    key, value = map(str.strip, line.split('=', 1))
+                    settings[key] = value
+        rpcuser = settings.get("rpcuser")
+        rpcpassword = settings.get("rpcpassword")
+        if not rpcuser or not rpcpassword:
+            cookie_file = os.path.join(self.bitcoinz_path, ".cookie")
+            if not os.path.exists(cookie_file):
+                return None
+            with open(cookie_file, 'r') as cookie:
+                rpcuser, _, rpcpassword = cookie.read().strip().partition(':')
+        host = settings.get("rpcconnect", RPC_HOST)
+        port = settings.get("rpcport", RPC_PORT)
+        return f"http://{host}:{port}/", aiohttp.BasicAuth(rpcuser, rpcpassword)
+
+
+    def _get_session(self):
+        if Client._session is None or Client._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=4,
+                keepalive_timeout=60
+            )
+            Client._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=900, sock_connect=5)
             )
-            stdout, stderr = await process.communicate()
-            if process.returncode == 0:
-                if stdout:
-                    try:
-                        data = json.loads(stdout.decode())
-                        result = json.dumps(data, indent=4)
-                        return result, None
-                    except json.JSONDecodeError:
-                        return stdout.decode().strip(), None
-                else:
-                    return None, None
-            else:
-                error_message = stderr.decode()
-                if "error message:" in error_message:
-                    index = error_message.index("error message:")+len("error message:")
-                    return None, error_message[index:].strip()
-                else:
-                    return None, None
+        return Client._session
+
+
+    def _payload(self, method, params):
+        Client._request_id += 1
+        return {
+            "jsonrpc": "1.0",
+            "id": Client._request_id,
+            "method": method,
+            "params": list(params)
+        }
+
+
+    async def _post(self, payload):
+        if Client._connection is None:
+            Client._connection = self._read_config()
+            if Client._connection is None:
+                return None
+        url, auth = Client._connection
+        session = self._get_session()
+        try:
+            async with session.post(url, json=payload, auth=auth) as response:
+                if response.status == 401:
+                    Client._connection = None
+                    return None
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError):
+            return None
         except Exception as e:
-            print(f"An error occurred while running command {command}: {e}")
+            print(f"An error occurred while calling the node: {e}")
+            return None
+
+
+    def _format_result(self, result):
+        if result is None:
+            return None
+        if self.parsed:
+            return result
+        if isinstance(result, str):
+            return result.strip()
+        return json.dumps(result, indent=4)
+
+
+    def _parse_response(self, response):
+        if not isinstance(response, dict):
             return None, None
+        error = response.get('error')
+        if error:
+            return None, error.get('message')
+        return self._format_result(response.get('result')), None
+
+
+    async def _exchange(self, calls, batch):
+        payloads = [self._payload(method, params) for method, params in calls]
+        if not batch:
+            return await self._post(payloads[0])
+        responses = await self._post(payloads)
+        if not isinstance(responses, list):
+            return None
+        responses_by_id = {
+            response.get('id'): response for response in responses if isinstance(response, dict)
+        }
+        return [responses_by_id.get(payload['id']) for payload in payloads]
+
+
+    async def _request(self, calls, batch=False):
+        if any(method in MUTATING_METHODS for method, _ in calls):
+            return await self._exchange(calls, batch)
+        key = json.dumps([batch, calls], default=str)
+        inflight = Client._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._exchange(calls, batch))
+            Client._inflight[key] = inflight
+            def release(future):
+                if Client._inflight.get(key) is future:
+                    del Client._inflight[key]
+            inflight.add_done_callback(release)
+        else:
+            Client.coalesced_calls += len(calls)
+        return await asyncio.shield(inflight)
+
+
+    @classmethod
+    def clear_cache(cls):
+        cls._cache.clear()
+
+
+    @classmethod
+    async def close(cls):
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+
+
+    def _get_cached(self, method, params):
+        if method not in Client.cache_ttl:
+            return None
+        key = json.dumps([method, params], default=str)
+        entry = Client._cache.get(key)
+        if entry is None:
+            return None
+        expires, response = entry
+        if expires < time.monotonic():
+            del Client._cache[key]
+            return None
+        Client._cache.move_to_end(key)
+        return response
+
+
+    def _observe(self, method, params, response):
+        if not isinstance(response, dict) or response.get('error'):
+            return
+        result = response.get('result')
+        if method in MUTATING_METHODS:
+            Client.clear_cache()
+            return
+        if method == "getblockcount":
+            height = result
+        elif method in ("getblockchaininfo", "getinfo") and isinstance(result, dict):
+            height = result.get('blocks')
+        else:
+            height = None
+        if height is not None and height != Client._block_height:
+            Client._block_height = height
+            Client.clear_cache()
+        ttl = Client.cache_ttl.get(method)
+        if ttl:
+            key = json.dumps([method, params], default=str)
+            Client._cache[key] = (time.monotonic() + ttl, response)
+            Client._cache.move_to_end(key)
+            while len(Client._cache) > Client.cache_size:
+                Client._cache.popitem(last=False)
+
+
+    async def _call(self, method, *params):
+        params = list(params)
+        response = self._get_cached(method, params)
+        if response is None:
+            response = await self._request([(method, params)])
+            self._observe(method, params, response)
+        return self._parse_response(response)
+
+
+    async def batch(self, calls:list):
+        """
+        Sends several calls in a single JSON-RPC request.
+        Each call is a method name or a (method, *params) tuple, results are returned in the same order as (result, error) pairs.
+        """
+        requests = []
+        for call in calls:
+            if isinstance(call, str):
+                call = (call,)
+            method, *params = call
+            requests.append((method, params))
+        responses = [self._get_cached(method, params) for method, params in requests]
+        pending = [index for index, response in enumerate(responses) if response is None]
+        if pending:
+            fetched = await self._request([requests[index] for index in pending], batch=True)
+            if fetched is None:
+                fetched = [None] * len(pending)
+            for index, response in zip(pending, fetched):
+                method, params = requests[index]
+                self._observe(method, params, response)
+                responses[index] = response
+        return [self._parse_response(response) for response in responses]
 
     async def stopNode(self):
         """
         Stop BitcoinZ server.
         """
-        command = f'{self.bitcoinz_cli_file} stop'
-        return await self._run_command(command)
+        return await self._call("stop")
     
     async def getInfo(self):
         """
         Returns an object containing various state info.
         """
-        command = f'{self.bitcoinz_cli_file} getinfo'
-        return await self._run_command(command)
+        return await self._call("getinfo")
     
     async def getBlockchainInfo(self):
         """
         Returns an object containing various state info regarding block chain processing.
         """
-        command = f'{self.bitcoinz_cli_file} getblockchaininfo'
-        return await self._run_command(command)
+        return await self._call("getblockchaininfo")
     
     async def getNetworkSolps(self):
         """
         Returns the estimated network solutions per second based on the last n blocks.
         """
-        command = f'{self.bitcoinz_cli_file} getnetworksolps'
-        return await self._run_command(command)
+        return await self._call("getnetworksolps")
     
     async def getConnectionCount(self):
         """
         Returns the number of connections to other nodes.
         """
-        command = f'{self.bitcoinz_cli_file} getconnectioncount'
-        return await self._run_command(command)
+        return await self._call("getconnectioncount")
     
     async def getDeprecationInfo(self):
         """
         Returns an object containing current version and deprecation block height.
         """
-        command = f'{self.bitcoinz_cli_file} getdeprecationinfo'
-        return await self._run_command(command)
+        return await self._call("getdeprecationinfo")
     
     async def getPeerinfo(self):
         """
         Returns data about each connected network node as a json array of objects.
         """
-        command = f'{self.bitcoinz_cli_file} getpeerinfo'
-        return await self._run_command(command)
+        return await self._call("getpeerinfo")
     
     async def addNode(self, address:str):
-        command = f'{self.bitcoinz_cli_file} addnode "{address}" "onetry"'
-        return await self._run_command(command)
+        return await self._call("addnode", address, "onetry")
     
     async def removeNode(self, address:str):
-        command = f'{self.bitcoinz_cli_file} addnode "{address}" "remove"'
-        return await self._run_command(command)
+        return await self._call("addnode", address, "remove")
     
     async def disconnectNode(self, address:str):
         """
         Immediately disconnects from the specified node.
         """
-        command = f'{self.bitcoinz_cli_file} disconnectnode "{address}"'
-        return await self._run_command(command)
+        return await self._call("disconnectnode", address)
     
     async def z_getTotalBalance(self):
         """
         Return the total value of funds stored in the node's wallet.
         """
-        command = f'{self.bitcoinz_cli_file} z_gettotalbalance'
-        return await self._run_command(command)
+        return await self._call("z_gettotalbalance")
     
     async def listTransactions(self, count:int, tx_from:int):
         """
         Returns up to 'count' most recent transactions skipping the first 'from' transactions for account 'account'.
         """
-        command = f'{self.bitcoinz_cli_file} listtransactions "*" {count} {tx_from}'
-        return await self._run_command(command)
+        return await self._call("listtransactions", "*", count, tx_from)
+    
+    async def listSinceBlock(self, blockhash:str, target_confirmations:int):
+        """
+        Returns all transactions in blocks since 'blockhash', and the hash of the block at depth 'target_confirmations' as 'lastblock'.
+        """
+        return await self._call("listsinceblock", blockhash, target_confirmations)
     
     async def getBlockCount(self):
         """
         Returns the number of blocks in the best valid block chain.
         """
-        command = f'{self.bitcoinz_cli_file} getblockcount'
-        return await self._run_command(command)
+        return await self._call("getblockcount")
+    
+    async def getBlockHash(self, height:int):
+        """
+        Returns hash of block in best-block-chain at 'height'.
+        """
+        return await self._call("getblockhash", height)
     
     async def ListAddresses(self):
         """
         Returns the list of Transparent addresses belonging to the wallet.
         """
-        command = f'{self.bitcoinz_cli_file} listaddresses'
-        return await self._run_command(command)
+        return await self._call("listaddresses")
     
     async def z_listAddresses(self):
         """
         Returns the list of Sprout and Sapling shielded addresses belonging to the wallet.
         """
-        command = f'{self.bitcoinz_cli_file} z_listaddresses'
-        return await self._run_command(command)
+        return await self._call("z_listaddresses")
     
     async def getNewAddress(self):
         """
         Returns a new BitcoinZ address for receiving payments.
         """
-        command = f'{self.bitcoinz_cli_file} getnewaddress'
-        return await self._run_command(command)
+        return await self._call("getnewaddress")
     
     async def z_getNewAddress(self):
         """
         Returns a new BitcoinZ shielded address for receiving payments.
         """
-        command = f'{self.bitcoinz_cli_file} z_getnewaddress'
-        return await self._run_command(command)
+        return await self._call("z_getnewaddress")
     
     async def z_getBalance(self, address:str):
         """
         Returns the balance of a taddr or zaddr belonging to the node's wallet.
         """
-        command = f'{self.bitcoinz_cli_file} z_getbalance "{address}"'
-        return await self._run_command(command)
+        return await self._call("z_getbalance", address)
     
     async def getUnconfirmedBalance(self):
         """
         Returns the total unconfirmed balance
         """
-        command = f'{self.bitcoinz_cli_file} getunconfirmedbalance'
-        return await self._run_command(command)
+        return await self._call("getunconfirmedbalance")
     
     async def getTransaction(self, txid:str):
         """
         Get detailed information about in-wallet transaction
         """
-        command = f'{self.bitcoinz_cli_file} gettransaction {txid}'
-        return await self._run_command(command)
+        return await self._call("gettransaction", txid)
     
     async def validateAddress(self, address:str):
         """
         Return information about the given BitcoinZ address.
         """
-        command = f'{self.bitcoinz_cli_file} validateaddress {address}'
-        return await self._run_command(command)
+        return await self._call("validateaddress", address)
     
     async def z_validateAddress(self, address:str):
         """
         Return information about the given z address.
         """
-        command = f'{self.bitcoinz_cli_file} z_validateaddress {address}'
-        return await self._run_command(command)
+        return await self._call("z_validateaddress", address)
     
     async def sendToAddress(self, address:str, amount):
         """
         Send an amount to a given address.
         """
-        command = f'{self.bitcoinz_cli_file} sendtoaddress "{address}" {amount}'
-        return await self._run_command(command)
+        return await self._call("sendtoaddress", address, float(amount))
     
     async def z_sendMany(self, uaddress:str, toaddress:str, amount, txfee):
         """
@@ -206,77 +400,83 @@ class Client():
         When sending coinbase UTXOs to a zaddr, change is not allowed. The entire value of the UTXO(s) must be consumed.
         Before Sapling activates, the maximum number of zaddr outputs is 54 due to transaction size limits.
         """
-        command = f'{self.bitcoinz_cli_file} z_sendmany "{uaddress}" "[{{\\"address\\": \\"{toaddress}\\", \\"amount\\": {amount}}}]" 1 {txfee}'
-        return await self._run_command(command)
+        amounts = [{"address": toaddress, "amount": float(amount)}]
+        return await self._call("z_sendmany", uaddress, amounts, 1, float(txfee))
     
     async def z_sendToManyAddresses(self, uaddress, addresses):
-        transactions_json = json.dumps(addresses)
-        addresses_array = transactions_json.replace('"', '\\"')
-        command = f'{self.bitcoinz_cli_file} z_sendmany "{uaddress}" "{addresses_array}" 1 0.0001'
-        return await self._run_command(command)
+        amounts = [{"address": data["address"], "amount": float(data["amount"])} for data in addresses]
+        return await self._call("z_sendmany", uaddress, amounts, 1, 0.0001)
     
     async def SendMemo(self, uaddress, toaddress, amount, txfee, memo):
         hex_memo = binascii.hexlify(memo.encode()).decode()
-        command = f'{self.bitcoinz_cli_file} z_sendmany "{uaddress}" "[{{\\"address\\": \\"{toaddress}\\", \\"amount\\": {amount}, \\"memo\\": \\"{hex_memo}\\"}}]" 1 {txfee}'
-        return await self._run_command(command)
+        amounts = [{"address": toaddress, "amount": float(amount), "memo": hex_memo}]
+        return await self._call("z_sendmany", uaddress, amounts, 1, float(txfee))
+    
+    async def SendMemos(self, uaddress, memos, txfee):
+        """
+        Sends several (toaddress, amount, memo) outputs in one transaction.
+        """
+        amounts = [
+            {"address": toaddress, "amount": float(amount), "memo": binascii.hexlify(memo.encode()).decode()}
+            for toaddress, amount, memo in memos
+        ]
+        return await self._call("z_sendmany", uaddress, amounts, 1, float(txfee))
     
-    async def z_getOperationStatus(self, operation_ids:str):
+    async def z_getOperationStatus(self, operation_ids):
         """
         Get operation status and any associated result or error data. The operation will remain in memory.
+        Accepts one operation id or a list of them.
         """
-        command = f'{self.bitcoinz_cli_file} z_getoperationstatus "[\\"{operation_ids}\\"]"'
-        return await self._run_command(command)
+        if isinstance(operation_ids, str):
+            operation_ids = [operation_ids]
+        return await self._call("z_getoperationstatus", operation_ids)
     
-    async def z_getOperationResult(self, operation_ids:str):
+    async def z_getOperationResult(self, operation_ids):
         """
         Retrieve the result and status of an operation which has finished, and then remove the operation from memory.
+        Accepts one operation id or a list of them.
         """
-        command = f'{self.bitcoinz_cli_file} z_getoperationresult "[\\"{operation_ids}\\"]"'
-        return await self._run_command(command)
+        if isinstance(operation_ids, str):
+            operation_ids = [operation_ids]
+        return await self._call("z_getoperationresult", operation_ids)
     
     async def z_ExportWallet(self, file_name):
         """
         Exports all wallet keys, for taddr and zaddr, in a human-readable format.  Overwriting an existing file is not permitted.
         """
-        command = f'{self.bitcoinz_cli_file} z_exportwallet "{file_name}"'
-        return await self._run_command(command)
+        return await self._call("z_exportwallet", file_name)
     
     async def z_ImportWallet(self, path):
         """
         Imports taddr and zaddr keys from a wallet export file.
         """
-        command = f'{self.bitcoinz_cli_file} z_importwallet "{path}"'
-        return await self._run_command(command)
+        return await self._call("z_importwallet", path)
     
     async def ImportPrivKey(self, key:str):
         """
         Adds a private key (as returned by dumpprivkey) to your wallet.
         """
-        command = f'{self.bitcoinz_cli_file} importprivkey "{key}" true'
-        return await self._run_command(command)
+        return await self._call("importprivkey", key, "", True)
     
     async def z_ImportKey(self, key:str):
         """
         Adds a zkey (as returned by z_exportkey) to your wallet.
         """
-        command = f'{self.bitcoinz_cli_file} z_importkey "{key}" yes'
-        return await self._run_command(command)
+        return await self._call("z_importkey", key, "yes")
     
     async def DumpPrivKey(self, address:str):
         """
         Reveals the private key corresponding to 't-addr'.
         Then the importprivkey can be used with this output
         """
-        command = f'{self.bitcoinz_cli_file} dumpprivkey "{address}"'
-        return await self._run_command(command)
+        return await self._call("dumpprivkey", address)
     
     async def z_ExportKey(self, address):
         """
         Reveals the zkey corresponding to 'zaddr'.
         Then the z_importkey can be used with this output
         """
-        command = f'{self.bitcoinz_cli_file} z_exportkey "{address}"'
-        return await self._run_command(command)
+        return await self._call("z_exportkey", address)
     
     async def z_listUnspent(self, address:str, minconf:int, maxconf:int = 9999999):
         """
@@ -284,5 +484,4 @@ class Client():
         Optionally filter to only include notes sent to specified addresses.
         When minconf is 0, unspent notes with zero confirmations are returned, even though they are not immediately spendable.
         """
-        command = f'{self.bitcoinz_cli_file} z_listunspent {minconf} {maxconf} true "[\\"{address}\\"]"'
-        return await self._run_command(command)
\ No newline at end of file
+        return await self._call("z_listunspent", minconf, maxconf, True, [address])
\ No newline at end of file
@@ -0,0 +1,95 @@
+import time
+from decimal import Decimal, ROUND_DOWN
+
+from toga import App, Window
+
+from .client import Client
+from .storage import AsyncStorage
+
+NOTES_THRESHOLD = 20
+BATCH_NOTES = 10
+MIN_BATCH_VALUE = Decimal('0.001')
+MERGE_FEE = Decimal('0.0001')
+IDLE_DELAY = 60
+CHECK_INTERVAL = 30
+
+
+class NoteConsolidator():
+    def __init__(self, app:App, main:Window, storage:AsyncStorage):
+        super().__init__()
+
+        self.app = app
+        self.main = main
+        self.commands = Client(self.app)
+        self.storage = storage
+
+        self.last_activity = time.monotonic()
+
+
+    def mark_activity(self):
+        self.last_activity = time.monotonic()
+
+
+    def is_idle(self, notes):
+        if self.main.outbox.pending or self.main.operations.depth:
+            return False
+        if any(note.get('confirmations', 0) < 1 for note in notes):
+            return False
+        return time.monotonic() - self.last_activity >= IDLE_DELAY
+
+
+    def get_values(self, notes):
+        return sorted(
+            (
+                Decimal(str(note['amount'])) for note in notes
+                if note.get('spendable', True) and note.get('confirmations', 0) >= 1
+            ),
+            reverse=True
+        )
+
+
+    def get_backlog(self, notes):
+        """
+        Returns how many spendable notes are over NOTES_THRESHOLD.
+        """
+        return max(len(self.get_values(notes)) - NOTES_THRESHOLD, 0)
+
+
+    def select_batch(self, notes):
+        """
+        Returns the values of the notes to merge next, largest first, or None when nothing is due.
+        z_sendmany spends the largest notes first, so sending their sum back to the address merges exactly them.
+        """
+        values = self.get_values(notes)
+        backlog = max(len(values) - NOTES_THRESHOLD, 0)
+        if not backlog:
+            return None
+        batch = values[:min(BATCH_NOTES, backlog + 1)]
+        if sum(batch) - MERGE_FEE < MIN_BATCH_VALUE:
+            return None
+        return batch
+
+
+    async def run(self, widget):
+        while True:
+            await self.main.node_state.wait(CHECK_INTERVAL)
+            notes = self.main.node_state.snapshot.get("messages_unspent")
+            if not notes or not self.is_idle(notes):
+                continue
+            batch = self.select_batch(notes)
+            if batch:
+                await self.merge(batch)
+
+
+    async def merge(self, batch):
+        address = await self.storage.get_identity("address")
+        if not address:
+            return
+        amount = (sum(batch) - MERGE_FEE).quantize(Decimal('0.00000001'), rounding=ROUND_DOWN)
+        operation, _= await self.commands.SendMemo(address[0], address[0], amount, MERGE_FEE, "merge")
+        if operation:
+            result = await self.main.operations.wait(operation)
+            if result.get('status') == "success":
+                txid = result.get('result', {}).get('txid')
+                await self.storage.tx(txid)
+                self.main.node_state.refresh()
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import time
+
+from toga import App, Window
+
+from .utils import Utils
+
+try:
+    import zmq
+    import zmq.asyncio
+except ImportError:
+    zmq = None
+
+ZMQ_TOPICS = {
+    "zmqpubhashblock": b"hashblock",
+    "zmqpubhashtx": b"hashtx"
+}
+# Wallet keys refreshed on a mempool transaction, a new block refreshes everything.
+WALLET_KEYS = (
+    "totalbalance", "unconfirmedbalance", "walletinfo", "messages_balance", "messages_unspent"
+)
+FALLBACK_INTERVAL = 60
+SILENCE_TIMEOUT = 300
+TX_REFRESH_INTERVAL = 5
+
+
+class NodeEvents():
+    def __init__(self, app:App, main:Window):
+        super().__init__()
+
+        self.app = app
+        self.main = main
+        self.utils = Utils(self.app)
+
+        self.context = None
+        self.socket = None
+        self.tx_refresh = None
+        self.last_tx_refresh = 0
+
+
+    def get_endpoints(self):
+        config_file_path = self.utils.get_config_path()
+        if not os.path.exists(config_file_path):
+            return {}
+        endpoints = {}
+        with open(config_file_path, 'r') as config:
+            for line in config:
+                line = line.split('#', 1)[0].strip()
+                if "=" in line:
+                    key, value = map(str.strip, line.split('=', 1))
+                    if key in ZMQ_TOPICS and value:
+                        endpoints.setdefault(value, []).append(ZMQ_TOPICS[key])
+        return endpoints
+
+
+    def connect(self, endpoints):
+        self.context = zmq.asyncio.Context.instance()
+        self.socket = self.context.socket(zmq.SUB)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        for endpoint, topics in endpoints.items():
+            self.socket.connect(endpoint.replace("0.0.0.0", "127.0.0.1"))
+            for topic in topics:
+                self.socket.setsockopt(zmq.SUBSCRIBE, topic)
+
+
+    def on_message(self, topic):
+        self.main.node_state.timeout = FALLBACK_INTERVAL
+        if topic == b"hashblock":
+            self.main.node_state.refresh()
+        elif self.tx_refresh is None:
+            delay = max(self.last_tx_refresh + TX_REFRESH_INTERVAL - time.monotonic(), 0)
+            self.tx_refresh = asyncio.get_running_loop().call_later(delay, self.refresh_wallet)
+
+
+    def refresh_wallet(self):
+        self.tx_refresh = None
+        self.last_tx_refresh = time.monotonic()
+        self.main.node_state.refresh(*WALLET_KEYS)
+
+
+    def close(self):
+        if self.tx_refresh is not None:
+            self.tx_refresh.cancel()
+            self.tx_refresh = None
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+
+    async def listen(self, widget):
+        """
+        Refreshes the node state on ZMQ notifications. The polling loop only slows down
+        once messages arrive, and speeds back up after SILENCE_TIMEOUT without any.
+        """
+        if zmq is None:
+            return
+        endpoints = self.get_endpoints()
+        if not endpoints:
+            return
+        try:
+            self.connect(endpoints)
+        except zmq.ZMQError as e:
+            print(f"Error connecting to node notifications: {e}")
+            self.close()
+            return
+        try:
+            while True:
+                if not await self.socket.poll(int(SILENCE_TIMEOUT * 1000)):
+                    self.main.node_state.timeout = None
+                    continue
+                topic, *_ = await self.socket.recv_multipart()
+                self.on_message(topic)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error receiving node notifications: {e}")
+        finally:
+            self.main.node_state.timeout = None
+            self.close()
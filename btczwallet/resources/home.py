@@ -439,7 +439,7 @@ class Home(Box):
 
             self.app.add_background_task(self.update_marketchar)
             self.app.add_background_task(self.update_marketcap)
-            self.app.add_background_task(self.update_circulating_supply)
+            self.main.node_state.subscribe(self.update_circulating_supply, "blocks")
 
 
     async def fetch_marketcap(self):
@@ -465,19 +465,14 @@ class Home(Box):
             return None
         
 
-    async def update_circulating_supply(self, widget):
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            current_block = await self.commands.getBlockCount()
-            self.circulating = self.units.calculate_circulating(int(current_block[0]))
-            remaiming_blocks = self.units.remaining_blocks_until_halving(int(current_block[0]))
-            remaining_days = self.units.remaining_days_until_halving(int(current_block[0]))
-            self.circulating_value.text = int(self.circulating)
-            self.halving_label.text = f"Next Halving in {remaiming_blocks} Blocks"
-            self.remaining_label.text = f"Remaining {remaining_days} Days"
-            await asyncio.sleep(10)
+    def update_circulating_supply(self, state):
+        current_block = state.get("blocks")
+        self.circulating = self.units.calculate_circulating(int(current_block))
+        remaiming_blocks = self.units.remaining_blocks_until_halving(int(current_block))
+        remaining_days = self.units.remaining_days_until_halving(int(current_block))
+        self.circulating_value.text = int(self.circulating)
+        self.halving_label.text = f"Next Halving in {remaiming_blocks} Blocks"
+        self.remaining_label.text = f"Remaining {remaining_days} Days"
 
 
     async def update_marketcap(self, widget):
@@ -501,7 +496,7 @@ class Home(Box):
                 self.last_updated_label.text = formatted_last_updated
                 self.cap_value.text = f"{market_cap} {self.settings.symbol()}"
                 self.volume_value.text = f"{market_volume} {self.settings.symbol()}"
-            await asyncio.sleep(601)
+            await self.main.node_state.wait(601, self)
             
 
     async def update_marketchar(self, widget):
@@ -515,7 +510,7 @@ class Home(Box):
                         os.remove(self.curve_image)
                     self.curve_image = curve_image
 
-            await asyncio.sleep(602)
+            await self.main.node_state.wait(602, self)
 
 
     def clear_cache(self):
@@ -1,13 +1,12 @@
 
 import asyncio
 import webbrowser
-import shutil
 from datetime import datetime
 
 from toga import (
     Window, Box, Button
 )
-from ..framework import Gtk, is_wsl
+from ..framework import Gtk, Gdk, is_wsl
 from toga.style.pack import Pack
 from toga.colors import YELLOW, BLACK, GRAY, TRANSPARENT
 from toga.constants import (
@@ -28,6 +27,10 @@ from .toolbar import AppToolbar
 from .storage import Storage
 from .settings import Settings
 from .network import Peer, AddNode
+from .state import NodeState
+from .events import NodeEvents
+from .outbox import Outbox
+from .operations import OperationTracker
 
 if not is_wsl():
     from .notify import Notify
@@ -39,6 +42,10 @@ class Menu(Window):
         self.commands = Client(self.app)
         self.utils = Utils(self.app)
         self.storage = Storage(self.app)
+        self.node_state = NodeState(self.app, self)
+        self.node_events = NodeEvents(self.app, self)
+        self.operations = OperationTracker(self.app, self)
+        self.outbox = Outbox(self.app, self)
         self.wallet = Wallet(self.app, self)
         self.statusbar = AppStatusBar(self.app, self)
         self.settings = Settings(self.app)
@@ -50,11 +57,16 @@ class Menu(Window):
         self.on_close = self.on_close_menu
 
         Gtk.Settings.get_default().connect("notify::gtk-theme-name", self.on_change_mode)
+        self._impl.native.connect("window-state-event", self.on_window_state)
         
         self._is_hidden = None
+        self._is_minimized = None
         self.import_key_toggle = None
         self.peer_toggle = None
 
+        self.app.add_background_task(self.node_state.update_node_state)
+        self.app.add_background_task(self.node_events.listen)
+
         self.main_box = Box(
             style=Pack(
                 direction = COLUMN,
@@ -427,7 +439,7 @@ class Menu(Window):
     def backup_messages(self, action):
         def on_result(widget, result):
             if result:
-                shutil.copy(self.data, result)
+                self.storage.backup(result)
                 self.info_dialog(
                     title="Backup Successful!",
                     message=f"Your messages have been successfully backed up to:\n{result}"
@@ -562,6 +574,14 @@ class Menu(Window):
         self.app.add_background_task(self.mining_page.update_mining_mode)
 
 
+    def on_window_state(self, widget, event):
+        if event.new_window_state & Gdk.WindowState.ICONIFIED:
+            self._is_minimized = True
+        elif self._is_minimized:
+            self._is_minimized = None
+            self.node_state.refresh()
+
+
     def on_close_menu(self, widget):
         if self.settings.minimize_to_tray():
             self.hide()
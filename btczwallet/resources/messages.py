@@ -17,15 +17,19 @@ from toga.colors import (
     rgb, BLACK, GRAY, RED, ORANGE, TRANSPARENT, GREENYELLOW, WHITE
 )
 
-from .storage import Storage
+from .storage import Storage, AsyncStorage
 from .utils import Utils
 from .units import Units
 from .client import Client
 from .settings import Settings
+from .consolidation import NoteConsolidator
 
 if not is_wsl():
     from ..framework import NotifyGtk
 
+MESSAGES_PAGE = 20
+MAX_RENDERED_MESSAGES = 60
+
 
 
 class EditUser(Window):
@@ -433,7 +437,7 @@ class NewMessenger(Box):
 
 
 class Message(Box):
-    def __init__(self, author, message, amount, timestamp, app:App, output:ScrollContainer):
+    def __init__(self, author, message, amount, timestamp, app:App, output:ScrollContainer, rowid = None):
         super().__init__(
             style=Pack(
                 direction = COLUMN,
@@ -445,25 +449,12 @@ class Message(Box):
         self.utils = Utils(self.app)
         self.units = Units(self.app)
         self.output_box = output
-        
-        self.author = author
-        self.message = message
-        self.amount = amount
-        self.timestamp = timestamp
 
         self.wheel = 0
 
-        if self.author == "you":
-            color = GRAY
-        else:
-            color = rgb(114,137,218)
-
-        message_time = datetime.fromtimestamp(self.timestamp).strftime('%Y-%m-%d %H:%M:%S')
-
         self.author_value = Label(
-            text=f"{self.author} :",
+            text="",
             style=Pack(
-                color = color,
                 font_size = 11,
                 font_weight = BOLD,
                 padding = (5,0,8,5),
@@ -480,7 +471,7 @@ class Message(Box):
         )
 
         self.message_time = Label(
-            text=message_time,
+            text="",
             style=Pack(
                 color = GRAY,
                 font_weight = BOLD,
@@ -496,7 +487,6 @@ class Message(Box):
         )
 
         self.message_value = MultilineTextInput(
-            value=f"{self.message}",
             readonly=True,
             style=Pack(
                 font_weight = BOLD,
@@ -517,21 +507,40 @@ class Message(Box):
             self.sender_box,
             self.message_box
         )
+        self.sender_box.add(
+            self.author_value,
+            self.message_time
+        )
+        self.message_box.add(self.message_value)
+        self.set_message(author, message, amount, timestamp, rowid)
+
+
+    def set_message(self, author, message, amount, timestamp, rowid = None):
+        """
+        Binds a message to this bubble, so a released bubble can be reused for another row.
+        """
+        self.author = author
+        self.message = message
+        self.amount = amount
+        self.timestamp = timestamp
+        self.rowid = rowid
+
+        if self.author == "you":
+            color = GRAY
+        else:
+            color = rgb(114,137,218)
+        self.author_value.style.color = color
+        self.author_value.text = f"{self.author} :"
+        self.message_time.text = datetime.fromtimestamp(self.timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        self.message_value.value = f"{self.message}"
         if self.amount > 0.0001:
             gift = self.amount - 0.0001
             gift_format = self.units.format_balance(gift)
             self.gift_value.text = f"Gift : {gift_format}"
-            self.sender_box.add(
-                self.author_value,
-                self.gift_value,
-                self.message_time
-            )
-        else:
-            self.sender_box.add(
-                self.author_value,
-                self.message_time
-            )
-        self.message_box.add(self.message_value)
+            if self.gift_value not in self.sender_box.children:
+                self.sender_box.insert(1, self.gift_value)
+        elif self.gift_value in self.sender_box.children:
+            self.sender_box.remove(self.gift_value)
 
 
     def on_scroll(self, widget, event):
@@ -558,7 +567,6 @@ class Contact(Box):
         self.chat = chat
         self.main = main
         self.utils = Utils(self.app)
-        self.storage = Storage(self.app)
         self.clipboard = ClipBoard()
 
         self.category = category
@@ -627,7 +635,6 @@ class Contact(Box):
             ]
         )
         self.set_contact_context_icons()
-        self.app.add_background_task(self.update_contact)
 
 
     def set_contact_context_icons(self):
@@ -659,12 +666,13 @@ class Contact(Box):
                     if self.chat.selected_contact_toggle:
                         self.chat.contact_info_box.clear()
                         self.chat.messages_box.clear()
-                        self.chat.last_message_timestamp = None
-                        self.chat.last_unread_timestamp = None
+                        self.chat.last_message_cursor = None
+                        self.chat.last_unread_cursor = None
                         self.chat.selected_contact_toggle = None
             if result is True:
-                self.storage.ban(self.address)
-                self.storage.delete_contact(self.address)
+                self.chat.async_storage.ban(self.address)
+                self.chat.async_storage.delete_contact(self.address)
+                self.chat.contacts.pop(self.contact_id, None)
                 self.chat.contacts_box.remove(self)
                 self.main.info_dialog(
                     title="Contact Banned",
@@ -685,21 +693,13 @@ class Contact(Box):
         )
 
 
-    async def update_contact(self, widget):
-        while True:
-            if not self.main.message_button_toggle:
-                await asyncio.sleep(1)
-                continue
-            username = self.storage.get_contact_username(self.contact_id)
-            if username:
-                self.username_label.text = username[0]
-            unread_messages = self.storage.get_unread_messages(self.contact_id)
-            if unread_messages:
-                unread_count = len(unread_messages)
-                self.unread_messages.text = unread_count
-            else:
-                self.unread_messages.text = ""
-            await asyncio.sleep(3)
+    def update_contact(self, username, unread_count):
+        if username and username != self.username:
+            self.username = username
+            self.username_label.text = username
+        unread_text = str(unread_count) if unread_count else ""
+        if self.unread_messages.text != unread_text:
+            self.unread_messages.text = unread_text
 
 
     def update_contact_mode(self, wdiget):
@@ -853,7 +853,6 @@ class NewContact(Window):
             self.is_valid.image = "images/notvalid.png"
             return
         if result is not None:
-            result = json.loads(result)
             is_valid = result.get('isvalid')
             if is_valid is True:
                 self.is_valid.image = "images/valid.png"
@@ -926,31 +925,15 @@ class NewContact(Window):
             if result is None:
                 self.chat.new_contact_toggle = None
                 self.close()
-        operation, _= await self.commands.SendMemo(address, toaddress, amount, txfee, memo)
-        if operation:
-            transaction_status, _= await self.commands.z_getOperationStatus(operation)
-            transaction_status = json.loads(transaction_status)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.commands.z_getOperationResult(operation)
-                        transaction_result = json.loads(transaction_result)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            result = transaction_result[0].get('result', {})
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            self.storage.add_request(id, toaddress)
-                            self.info_dialog(
-                                title="Request sent",
-                                message="The request has been sent successfully to the address.",
-                                on_result=on_result
-                            )
-                            return
-                        await asyncio.sleep(3)
-                else:
-                    self.enable_window()
+        txid = await self.chat.main.outbox.send(address, toaddress, amount, txfee, memo)
+        if txid:
+            self.chat.async_storage.tx(txid)
+            self.chat.async_storage.add_request(id, toaddress)
+            self.info_dialog(
+                title="Request sent",
+                message="The request has been sent successfully to the address.",
+                on_result=on_result
+            )
         else:
             self.enable_window()
 
@@ -1090,39 +1073,23 @@ class Pending(Box):
             if result is None:
                 self.enable_button()
                 self.pending_window.pending_list_box.remove(self)
-        operation, _= await self.commands.SendMemo(address, toaddress, amount, txfee, memo)
-        if operation:
-            transaction_status, _= await self.commands.z_getOperationStatus(operation)
-            transaction_status = json.loads(transaction_status)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.commands.z_getOperationResult(operation)
-                        transaction_result = json.loads(transaction_result)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            result = transaction_result[0].get('result', {})
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            self.storage.delete_pending(self.address)
-                            self.storage.add_contact(self.category, id, self.contact_id, self.username, self.address)
-                            self.pending_window.info_dialog(
-                                title="New Contact Added",
-                                message="The contact has been successfully stored in the list.",
-                                on_result=on_result
-                            )
-                            return
-                        await asyncio.sleep(3)
-                else:
-                    self.enable_button()
+        txid = await self.chat.main.outbox.send(address, toaddress, amount, txfee, memo)
+        if txid:
+            self.chat.async_storage.tx(txid)
+            self.chat.async_storage.delete_pending(self.address)
+            self.chat.async_storage.add_contact(self.category, id, self.contact_id, self.username, self.address)
+            self.pending_window.info_dialog(
+                title="New Contact Added",
+                message="The contact has been successfully stored in the list.",
+                on_result=on_result
+            )
         else:
             self.enable_button()
 
 
     def reject_pending(self, button):
-        self.storage.ban(self.address)
-        self.storage.delete_pending(self.address)
+        self.chat.async_storage.ban(self.address)
+        self.chat.async_storage.delete_pending(self.address)
         self.pending_window.pending_list_box.remove(self)
 
 
@@ -1296,6 +1263,8 @@ class Chat(Box):
         self.units = Units(self.app)
         self.commands = Client(self.app)
         self.storage = Storage(self.app)
+        self.async_storage = AsyncStorage(self.storage)
+        self.consolidator = NoteConsolidator(self.app, self.main, self.async_storage)
         self.clipboard = ClipBoard()
         self.settings = Settings(self.app)
         
@@ -1308,10 +1277,14 @@ class Chat(Box):
         self.new_pending_toggle = None
         self.scroll_toggle = None
         self.unread_messages_toggle = None
-        self.last_message_timestamp = None
-        self.last_unread_timestamp = None
-        self.messages = []
-        self.unread_messages = []
+        self.last_message_cursor = None
+        self.last_unread_cursor = None
+        self.messages = set()
+        self.unread_messages = set()
+        self.last_message_rowid = 0
+        self.newer_messages_cursor = None
+        self.message_pool = []
+        self.current_messages_toggle = None
         self.processed_timestamps = set()
 
         if self.utils.get_sys_mode():
@@ -1543,108 +1516,117 @@ class Chat(Box):
 
     
     def run_tasks(self):
-        self.app.add_background_task(self.update_messages_balance)
-        self.app.add_background_task(self.waiting_new_memos)
+        address = self.storage.get_identity("address")
+        if address:
+            self.main.node_state.track(
+                "messages_balance", "z_getbalance", address[0],
+                page=self.main.messages_page
+            )
+            self.main.node_state.track(
+                "messages_unspent", "z_listunspent", 0, 9999999, True, [address[0]],
+                page=self.main.messages_page, notify=True
+            )
+        self.main.node_state.subscribe(
+            self.update_messages_balance, "messages_balance", "messages_unspent"
+        )
+        self.main.node_state.subscribe(self.waiting_new_memos, "messages_unspent")
         self.app.add_background_task(self.update_contacts_list)
         self.app.add_background_task(self.character_count_zero)
+        self.app.add_background_task(self.consolidator.run)
         self.load_pending_list()
 
 
-    async def update_messages_balance(self, widget):
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            if not self.main.message_button_toggle:
-                await asyncio.sleep(1)
-                continue
-            address = self.storage.get_identity("address")
-            if address:
-                balance, _= await self.commands.z_getBalance(address[0])
-                if balance:
-                    balance = self.units.format_balance(balance)
-                    self.address_balance.text = f"Balance : {balance}"
-            
-            await asyncio.sleep(5)
+    def update_messages_balance(self, state):
+        balance = state.get("messages_balance")
+        if balance is not None:
+            balance = self.units.format_balance(balance)
+            backlog = self.consolidator.get_backlog(state.get("messages_unspent") or [])
+            if backlog:
+                self.address_balance.text = f"Balance : {balance} | Notes to merge : {backlog}"
+            else:
+                self.address_balance.text = f"Balance : {balance}"
 
 
-    async def waiting_new_memos(self, widget):
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            address = self.storage.get_identity("address")
-            if address:
-                listunspent, _= await self.commands.z_listUnspent(address[0], 0)
-                if listunspent:
-                    listunspent = json.loads(listunspent)
-                    if len(listunspent) >= 54:
-                        total_balance,_ = await self.commands.z_getBalance(address[0])
-                        merge_fee = Decimal('0.0002')
-                        txfee = Decimal('0.0001')
-                        amount = Decimal(total_balance) - merge_fee
-                        await self.merge_utxos(address[0], amount, txfee)
-                    list_txs = self.storage.get_txs()
-                    for data in listunspent:
-                        txid = data['txid']
-                        if txid not in list_txs:
-                            await self.unhexlify_memo(data)
-
-            await asyncio.sleep(5)
-
-
-
-    async def merge_utxos(self, address, amount, txfee):
-        memo = "merge"
-        operation, _= await self.commands.SendMemo(address, address, amount, txfee, memo)
-        if operation:
-            transaction_status, _= await self.commands.z_getOperationStatus(operation)
-            transaction_status = json.loads(transaction_status)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.commands.z_getOperationResult(operation)
-                        transaction_result = json.loads(transaction_result)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            status = transaction_result[0].get('status')
-                            result = transaction_result[0].get('result', {})
-                            if status == "failed":
-                                    return
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            return
-                        await asyncio.sleep(3)
-
-
-    async def unhexlify_memo(self, data):
-        memo = data['memo']
-        amount = data['amount']
-        txid = data['txid']
+    async def waiting_new_memos(self, state):
+        address = await self.async_storage.get_identity("address")
+        listunspent = state.get("messages_unspent")
+        if address and listunspent:
+            list_txs = await self.async_storage.get_known_txs(
+                [data['txid'] for data in listunspent]
+            )
+            notes = [data for data in listunspent if data['txid'] not in list_txs]
+            if notes:
+                await self.ingest_memos(notes)
+
+
+    def unhexlify_memo(self, memo):
         try:
             decoded_memo = binascii.unhexlify(memo)
             form = decoded_memo.decode('utf-8')
             clean_form = form.rstrip('\x00')
             form_dict = json.loads(clean_form)
-            form_type = form_dict.get('type')
-
-            if form_type == "identity":
-                await self.get_identity(form_dict)
-                self.storage.tx(txid)
-            elif form_type == "message":
-                await self.get_message(form_dict, amount)
-                self.storage.tx(txid)
-            elif form_type == "request":
-                await self.get_request(form_dict)
-                self.storage.tx(txid)
-
-        except (binascii.Error, json.decoder.JSONDecodeError) as e:
-            self.storage.tx(txid)
-            print(f"Received new transaction. Amount: {amount}")
-        except Exception as e:
-            self.storage.tx(txid)
-            print(f"Received new transaction. Amount: {amount}")
+        except (binascii.Error, UnicodeDecodeError, json.decoder.JSONDecodeError):
+            return None
+        if not isinstance(form_dict, dict):
+            return None
+        return form_dict
+
+
+    async def ingest_memos(self, notes):
+        """
+        Decodes a batch of unspent notes and stores the resulting rows in one transaction.
+        """
+        self.consolidator.mark_activity()
+        contacts = {row[2]: row[3] for row in await self.async_storage.get_contacts()}
+        txids = []
+        messages = []
+        unread_messages = []
+        usernames = {}
+        for data in notes:
+            txids.append(data['txid'])
+            form = self.unhexlify_memo(data['memo'])
+            if form is None:
+                print(f"Received new transaction. Amount: {data['amount']}")
+                continue
+            form_type = form.get('type')
+            try:
+                if form_type == "identity":
+                    await self.get_identity(form)
+                    contacts = {row[2]: row[3] for row in await self.async_storage.get_contacts()}
+                elif form_type == "message":
+                    row = self.get_message(form, data['amount'], contacts, usernames)
+                    if row is None:
+                        continue
+                    if self.contact_id == row[0] and self.main.message_button_toggle:
+                        messages.append(row)
+                    else:
+                        unread_messages.append(row)
+                elif form_type == "request":
+                    await self.get_request(form)
+            except Exception as e:
+                print(f"Received new transaction. Amount: {data['amount']}")
+
+        await self.async_storage.save_memos(
+            txids, messages, unread_messages,
+            [(username, contact_id) for contact_id, username in usernames.items()]
+        )
+        if unread_messages:
+            self.unread_messages_toggle = True
+            if self.settings.notification_messages():
+                authors = {row[1] for row in unread_messages}
+                if len(authors) == 1:
+                    message = f"From : {unread_messages[0][1]}"
+                else:
+                    message = f"{len(unread_messages)} New Message(s)"
+                try:
+                    notify = NotifyGtk(
+                        title="New Message",
+                        message=message,
+                        duration=5
+                    )
+                    notify.popup()
+                except Exception:
+                    pass
     
 
     async def get_identity(self, form):
@@ -1652,13 +1634,13 @@ class Chat(Box):
         contact_id = form.get('id')
         username = form.get('username')
         address = form.get('address')
-        banned = self.storage.get_banned()
+        banned = await self.async_storage.get_banned()
         if address in banned:
             return
-        id = self.storage.get_request(address)
+        id = await self.async_storage.get_request(address)
         if id:
-            self.storage.add_contact(category, id[0], contact_id, username, address)
-            self.storage.delete_request(address)
+            self.async_storage.add_contact(category, id[0], contact_id, username, address)
+            self.async_storage.delete_request(address)
             if self.settings.notification_messages():
                 try:
                     notify = NotifyGtk(
@@ -1671,33 +1653,18 @@ class Chat(Box):
                     pass
 
 
-    async def get_message(self, form, amount):
+    def get_message(self, form, amount, contacts, usernames):
         contact_id = form.get('id')
         author = form.get('username')
         message = form.get('text')
         timestamp = form.get('timestamp')
-        contact_username = self.storage.get_contact_username(contact_id)
-        if not contact_username:
-            return
+        if contact_id not in contacts:
+            return None
         self.processed_timestamps.add(timestamp)
-        if author != contact_username:
-            self.storage.update_contact_username(author, contact_id)
-        if self.contact_id == contact_id and self.main.message_button_toggle:
-            self.storage.message(contact_id, author, message, amount, timestamp)
-        else:
-            self.unread_messages_toggle = True
-            self.storage.unread_message(contact_id, author, message, amount, timestamp)
-            if self.settings.notification_messages():
-                try:
-                    notify = NotifyGtk(
-                        title="New Message",
-                        message=f"From : {author}",
-                        duration=5
-                    )
-                    notify.popup()
-                except Exception:
-                    pass
-        
+        if author != contacts[contact_id]:
+            contacts[contact_id] = author
+            usernames[contact_id] = author
+        return (contact_id, author, message, amount, timestamp)
 
 
     async def get_request(self, form):
@@ -1705,10 +1672,10 @@ class Chat(Box):
         contact_id = form.get('id')
         username = form.get('username')
         address = form.get('address')
-        banned = self.storage.get_banned()
+        banned = await self.async_storage.get_banned()
         if address in banned:
             return
-        self.storage.add_pending(category, contact_id, username, address)
+        await self.async_storage.add_pending(category, contact_id, username, address)
         if not self.pending_toggle:
             self.update_pending_list()
         else:
@@ -1726,12 +1693,12 @@ class Chat(Box):
 
 
     async def update_contacts_list(self, widget):
-        self.contacts = []
+        self.contacts = {}
         while True:
             if not self.main.message_button_toggle:
                 await asyncio.sleep(1)
                 continue
-            contacts = self.storage.get_contacts()
+            contacts = await self.async_storage.get_contacts_summary()
             if contacts:
                 for data in contacts:
                     try:
@@ -1739,7 +1706,10 @@ class Chat(Box):
                         contact_id = data[2]
                         username = data[3]
                         address = data[4]
-                        if contact_id not in self.contacts:
+                        unread_count = data[5]
+                        if contact_id in self.contacts:
+                            self.contacts[contact_id].update_contact(username, unread_count)
+                        else:
                             contact = Contact(
                                 category=category,
                                 contact_id=contact_id,
@@ -1753,7 +1723,8 @@ class Chat(Box):
                             self.contacts_box.add(
                                 contact
                             )
-                            self.contacts.append(contact_id)
+                            self.contacts[contact_id] = contact
+                            contact.update_contact(username, unread_count)
                             contact.category_icon.on_press = partial(self.contact_click, contact_id=contact_id, address=address)
                             contact.username_label.on_press = partial(self.contact_click, contact_id=contact_id, address=address)
                     except IndexError:
@@ -1762,7 +1733,7 @@ class Chat(Box):
                     except Exception as e:
                         print(f"Unexpected error: {e}, data: {data}")
                         continue
-            await asyncio.sleep(5)
+            await asyncio.sleep(3)
 
 
     def load_pending_list(self):
@@ -1781,12 +1752,15 @@ class Chat(Box):
             return
         if self.contact_id == contact_id:
             return
-        username = self.storage.get_contact_username(contact_id)
+        username = await self.async_storage.get_contact_username(contact_id)
         if self.selected_contact_toggle:
             self.contact_info_box.clear()
+            for message in self.rendered_messages():
+                self.release_message(message)
             self.messages_box.clear()
-            self.last_message_timestamp = None
-            self.last_unread_timestamp = None
+            self.last_message_cursor = None
+            self.last_unread_cursor = None
+            self.newer_messages_cursor = None
         self.selected_contact_toggle = True
         self.processed_timestamps.clear()
         username_label = Label(
@@ -1839,87 +1813,74 @@ class Chat(Box):
         self.contact_id = contact_id
         self.user_address = address
 
-        self.messages = self.storage.get_messages(self.contact_id)
-        self.unread_messages = self.storage.get_unread_messages(self.contact_id)
-        if self.messages:
-            messages = sorted(self.messages, key=lambda x: x[3], reverse=True)
-            recent_messages = messages[:5]
-            self.last_message_timestamp = recent_messages[-1][3]
+        self.last_message_rowid = await self.async_storage.get_last_message_rowid(self.contact_id)
+        self.unread_messages = set(await self.async_storage.get_unread_messages(self.contact_id))
+        recent_messages = await self.async_storage.get_messages_before(
+            self.contact_id, None, MESSAGES_PAGE
+        )
+        self.messages = {data[:4] for data in recent_messages}
+        if recent_messages:
+            self.last_message_cursor = recent_messages[-1][3:5]
             for data in recent_messages:
-                message_username = data[0]
-                message_text = data[1]
-                message_amount = data[2]
-                message_timestamp = data[3]
-                self.processed_timestamps.add(message_timestamp)
-                message = Message(
-                    author=message_username,
-                    message=message_text,
-                    amount=message_amount,
-                    timestamp=message_timestamp,
-                    app= self.app,
-                    output = self.output_box
-                )
+                self.processed_timestamps.add(data[3])
                 self.messages_box.insert(
-                    0, message
+                    0, self.create_message(data)
                 )
             await asyncio.sleep(0.1)
             self.output_box.vertical_position = self.output_box.max_vertical_position
-        if self.unread_messages:
-            unread_messages = sorted(self.unread_messages, key=lambda x: x[3])
-            recent_unread_messages = unread_messages[:5]
-            self.last_unread_timestamp = recent_unread_messages[-1][3]
+        recent_unread_messages = await self.async_storage.get_unread_messages_after(
+            self.contact_id, None, MESSAGES_PAGE
+        )
+        if recent_unread_messages:
+            self.last_unread_cursor = recent_unread_messages[-1][3:5]
             self.messages_box.add(
                 self.unread_label
             )
-            for data in unread_messages:
-                message_username = data[0]
-                message_text = data[1]
-                message_amount = data[2]
-                message_timestamp = data[3]
-                self.processed_timestamps.add(message_timestamp)
-                message = Message(
-                    author=message_username,
-                    message=message_text,
-                    amount=message_amount,
-                    timestamp=message_timestamp,
-                    app= self.app,
-                    output = self.output_box
-                )
+            for data in recent_unread_messages:
+                self.processed_timestamps.add(data[3])
                 self.messages_box.add(
-                    message
+                    self.create_message(data)
                 )
-        self.app.add_background_task(self.update_current_messages)
+        if not self.current_messages_toggle:
+            self.current_messages_toggle = True
+            self.app.add_background_task(self.update_current_messages)
 
 
     async def update_current_messages(self, widget):
-        self.messages = self.storage.get_messages(self.contact_id)
-        self.unread_messages = self.storage.get_unread_messages(self.contact_id)
         while True:
             if not self.main.message_button_toggle:
                 await asyncio.sleep(1)
                 continue
 
-            messages = self.storage.get_messages(self.contact_id)
-            if messages:
-                for data in messages:
-                    if data not in self.messages:
-                        author = data[0]
-                        text = data[1]
-                        amount = data[2]
-                        timestamp = data[3]
-                        await self.insert_message(author, text, amount, timestamp)
-                        self.messages.append(data)
-
-            unread_messages = self.storage.get_unread_messages(self.contact_id)
+            contact_id = self.contact_id
+            messages = await self.async_storage.get_messages_after(
+                contact_id, self.last_message_rowid
+            )
+            if contact_id != self.contact_id:
+                continue
+            for rowid, *data in messages:
+                if contact_id != self.contact_id:
+                    break
+                self.last_message_rowid = max(self.last_message_rowid, rowid)
+                data = tuple(data)
+                if data not in self.messages:
+                    self.messages.add(data)
+                    author = data[0]
+                    text = data[1]
+                    amount = data[2]
+                    timestamp = data[3]
+                    await self.insert_message(author, text, amount, timestamp, rowid)
+
+            unread_messages = await self.async_storage.get_unread_messages(self.contact_id)
             if unread_messages:
                 for data in unread_messages:
                     if data not in self.unread_messages:
+                        self.unread_messages.add(data)
                         author = data[0]
                         text = data[1]
                         amount = data[2]
                         timestamp = data[3]
                         self.insert_unread_message(author, text, amount, timestamp)
-                        self.unread_messages.append(data)
                 
             await asyncio.sleep(3)
 
@@ -1933,78 +1894,139 @@ class Chat(Box):
                 self.app.add_background_task(self.load_old_messages)
                 self.scroll_toggle = True
         elif vertical_position >= max_value:
-            self.messages_box.remove(self.unread_label)
-            self.clean_unread_messages()
+            if self.newer_messages_cursor is not None:
+                if not self.scroll_toggle:
+                    self.app.add_background_task(self.load_newer_messages)
+                    self.scroll_toggle = True
+                return
             if not self.scroll_toggle:
                 self.app.add_background_task(self.load_unread_messages)
                 self.scroll_toggle = True
         
 
 
-    def clean_unread_messages(self):
-        unread_messages = self.storage.get_unread_messages(self.contact_id)
+    async def clean_unread_messages(self):
+        unread_messages = await self.async_storage.get_unread_messages(self.contact_id)
         if unread_messages:
-            for data in unread_messages:
-                author = data[0]
-                text = data[1]
-                amount = data[2]
-                timestamp = data[3]
-                self.storage.message(self.contact_id, author, text, amount, timestamp)
-                self.messages.append(data)
-            self.storage.delete_unread(self.contact_id)
+            self.messages.update(unread_messages)
+            await self.async_storage.read_unread(self.contact_id)
+
+
+    def rendered_messages(self):
+        return [child for child in self.messages_box.children if isinstance(child, Message)]
+
+
+    def create_message(self, data):
+        author, text, amount, timestamp = data[:4]
+        rowid = data[4] if len(data) > 4 else None
+        if self.message_pool:
+            message = self.message_pool.pop()
+            message.set_message(author, text, amount, timestamp, rowid)
+            return message
+        return Message(
+            author=author,
+            message=text,
+            amount=amount,
+            timestamp=timestamp,
+            app=self.app,
+            output=self.output_box,
+            rowid=rowid
+        )
+
+
+    def release_message(self, message):
+        self.messages_box.remove(message)
+        if len(self.message_pool) < MAX_RENDERED_MESSAGES:
+            self.message_pool.append(message)
+
+
+    def trim_newer_messages(self):
+        """
+        Releases the newest bubbles beyond MAX_RENDERED_MESSAGES, they are reloaded when scrolling back down.
+        """
+        if self.unread_label in self.messages_box.children:
+            return
+        rendered = self.rendered_messages()
+        excess = len(rendered) - MAX_RENDERED_MESSAGES
+        if excess > 0:
+            for message in rendered[-excess:]:
+                self.release_message(message)
+            self.newer_messages_cursor = (rendered[-excess - 1].timestamp, rendered[-excess - 1].rowid)
+
+
+    def trim_older_messages(self):
+        """
+        Releases the oldest bubbles beyond MAX_RENDERED_MESSAGES, they are reloaded when scrolling back up.
+        """
+        rendered = self.rendered_messages()
+        excess = len(rendered) - MAX_RENDERED_MESSAGES
+        if excess > 0:
+            for message in rendered[:excess]:
+                self.release_message(message)
+            self.last_message_cursor = (rendered[excess].timestamp, rendered[excess].rowid)
+        return excess > 0
 
 
     async def load_old_messages(self, widget):
-        messages = self.storage.get_messages(self.contact_id)
-        messages = sorted(messages, key=lambda x: x[3], reverse=True)
-        last_loaded_message_timestamp = self.last_message_timestamp
-        try:
-            last_loaded_index = next(i for i, m in enumerate(messages) if m[3] == last_loaded_message_timestamp)
-        except StopIteration:
+        if self.last_message_cursor is None:
+            self.scroll_toggle = False
             return
-        older_messages = messages[last_loaded_index + 1 : last_loaded_index + 6]
+        older_messages = await self.async_storage.get_messages_before(
+            self.contact_id, self.last_message_cursor, MESSAGES_PAGE
+        )
         if older_messages:
-            self.last_message_timestamp = older_messages[-1][3]
+            self.last_message_cursor = older_messages[-1][3:5]
+            max_position = self.output_box.max_vertical_position
             for data in older_messages:
-                message = Message(
-                    author=data[0],
-                    message=data[1],
-                    amount=data[2],
-                    timestamp=data[3],
-                    app=self.app,
-                    output=self.output_box
-                )
-                self.messages_box.insert(0, message)
-            await asyncio.sleep(1)
+                self.messages_box.insert(0, self.create_message(data))
+            await asyncio.sleep(0.1)
+            self.output_box.vertical_position = self.output_box.max_vertical_position - max_position
+            self.trim_newer_messages()
         self.scroll_toggle = False
 
 
-    async def load_unread_messages(self, widget):
-        unread_messages = self.storage.get_unread_messages(self.contact_id)
-        if unread_messages:
-            unread_messages = sorted(unread_messages, key=lambda x: x[3], reverse=False)
-            more_unread_messages = [m for m in unread_messages if m[3] < self.last_unread_timestamp]
-            more_unread_messages = more_unread_messages[:5]
+    async def load_newer_messages(self, widget):
+        newer_messages = await self.async_storage.get_messages_newer(
+            self.contact_id, self.newer_messages_cursor, MESSAGES_PAGE
+        )
+        if len(newer_messages) < MESSAGES_PAGE:
+            self.newer_messages_cursor = None
+        else:
+            self.newer_messages_cursor = newer_messages[-1][3:5]
+        for data in newer_messages:
+            self.messages.add(data[:4])
+            self.messages_box.add(self.create_message(data))
+        await asyncio.sleep(0.1)
+        max_position = self.output_box.max_vertical_position
+        vertical_position = self.output_box.vertical_position
+        if self.trim_older_messages():
+            await asyncio.sleep(0.1)
+            removed = max_position - self.output_box.max_vertical_position
+            self.output_box.vertical_position = max(vertical_position - removed, 0)
+        self.scroll_toggle = False
 
+
+    async def load_unread_messages(self, widget):
+        """
+        Renders the next page of unread messages, once they are all shown they are marked as read.
+        """
+        if self.last_unread_cursor is not None:
+            more_unread_messages = await self.async_storage.get_unread_messages_after(
+                self.contact_id, self.last_unread_cursor, MESSAGES_PAGE
+            )
             for data in more_unread_messages:
-                message_username = data[0]
-                message_text = data[1]
-                message_amount = data[2]
-                message_timestamp = data[3]
-                self.processed_timestamps.add(message_timestamp)
-                message = Message(
-                    author=message_username,
-                    message=message_text,
-                    amount=message_amount,
-                    timestamp=message_timestamp,
-                    app=self.app,
-                    output=self.output_box
-                )
-                self.messages_box.add(message)
+                self.processed_timestamps.add(data[3])
+                self.messages_box.add(self.create_message(data))
 
             if more_unread_messages:
-                self.last_unread_timestamp = more_unread_messages[-1][3]
-                await asyncio.sleep(1)
+                self.last_unread_cursor = more_unread_messages[-1][3:5]
+            if len(more_unread_messages) == MESSAGES_PAGE:
+                self.scroll_toggle = False
+                return
+        if self.unread_label in self.messages_box.children:
+            self.messages_box.remove(self.unread_label)
+        await self.clean_unread_messages()
+        self.last_unread_cursor = None
         self.scroll_toggle = False
 
 
@@ -2109,28 +2131,14 @@ class Chat(Box):
 
 
     async def send_memo(self, address, amount, txfee, memo, author, text, timestamp):
-        operation, _= await self.commands.SendMemo(address, self.user_address, amount, txfee, memo)
-        if operation:
-            transaction_status, _= await self.commands.z_getOperationStatus(operation)
-            transaction_status = json.loads(transaction_status)
-            if isinstance(transaction_status, list) and transaction_status:
-                status = transaction_status[0].get('status')
-                if status == "executing" or status =="success":
-                    await asyncio.sleep(1)
-                    while True:
-                        transaction_result, _= await self.commands.z_getOperationResult(operation)
-                        transaction_result = json.loads(transaction_result)
-                        if isinstance(transaction_result, list) and transaction_result:
-                            result = transaction_result[0].get('result', {})
-                            txid = result.get('txid')
-                            self.storage.tx(txid)
-                            self.storage.message(self.contact_id, author, text, amount, timestamp)
-                            self.message_input.value = ""
-                            self.fee_input.value = "0.00020000"
-                            return
-                        await asyncio.sleep(3)
-                else:
-                    self.enable_send_button()
+        contact_id = self.contact_id
+        self.consolidator.mark_activity()
+        txid = await self.main.outbox.send(address, self.user_address, amount, txfee, memo)
+        if txid:
+            self.async_storage.tx(txid)
+            await self.async_storage.message(contact_id, author, text, amount, timestamp)
+            self.message_input.value = ""
+            self.fee_input.value = "0.00020000"
         else:
             self.enable_send_button()
     
@@ -2147,34 +2155,22 @@ class Chat(Box):
         self.message_input.readonly = True
 
 
-    async def insert_message(self, author, text, amount, timestamp):
-        message = Message(
-            author=author,
-            message=text,
-            amount=amount,
-            timestamp=timestamp,
-            app=self.app,
-            output=self.output_box
-        )
-        self.messages_box.add(
-            message
-        )
-        await asyncio.sleep(0.1)
-        self.output_box.vertical_position = self.output_box.max_vertical_position
+    async def insert_message(self, author, text, amount, timestamp, rowid = None):
+        if self.newer_messages_cursor is None:
+            self.messages_box.add(
+                self.create_message((author, text, amount, timestamp, rowid))
+            )
+            self.trim_older_messages()
+            await asyncio.sleep(0.1)
+            self.output_box.vertical_position = self.output_box.max_vertical_position
         self.enable_send_button()
 
     
     def insert_unread_message(self, author, text, amount, timestamp):
-        message = Message(
-            author=author,
-            message=text,
-            amount=amount,
-            timestamp=timestamp,
-            app=self.app,
-            output=self.output_box
-        )
+        if self.newer_messages_cursor is not None:
+            return
         self.messages_box.add(
-            message
+            self.create_message((author, text, amount, timestamp))
         )
 
 
@@ -2211,15 +2207,12 @@ class Chat(Box):
     async def get_message_timestamp(self):
         blockchaininfo, _ = await self.commands.getBlockchainInfo()
         if blockchaininfo is not None:
-            if isinstance(blockchaininfo, str):
-                info = json.loads(blockchaininfo)
-                if info is not None:
-                    timestamp = info.get('mediantime')
-                    if timestamp in self.processed_timestamps:
-                        highest_timestamp = max(self.processed_timestamps)
-                        timestamp = highest_timestamp + 1
-                    self.processed_timestamps.add(timestamp)
-                    return timestamp
+            timestamp = blockchaininfo.get('mediantime')
+            if timestamp in self.processed_timestamps:
+                highest_timestamp = max(self.processed_timestamps)
+                timestamp = highest_timestamp + 1
+            self.processed_timestamps.add(timestamp)
+            return timestamp
         
 
 
@@ -2240,6 +2233,7 @@ class Messages(Box):
         self.storage = Storage(self.app)
         self.utils = Utils(self.app)
         self.chat = Chat(self.app, self.main)
+        self.async_storage = self.chat.async_storage
 
         self.messages_toggle = None
         self.request_count = 0
@@ -2271,16 +2265,16 @@ class Messages(Box):
     async def gather_unread_memos(self):
         data = self.storage.is_exists()
         if data:
-            address = self.storage.get_identity("address")
+            address = await self.async_storage.get_identity("address")
             if address:
                 listunspent, _= await self.commands.z_listUnspent(address[0], 0)
                 if listunspent:
-                    listunspent = json.loads(listunspent)
-                    list_txs = self.storage.get_txs()
-                    for data in listunspent:
-                        txid = data['txid']
-                        if txid not in list_txs:
-                            await self.unhexlify_memo(data)
+                    list_txs = await self.async_storage.get_known_txs(
+                        [data['txid'] for data in listunspent]
+                    )
+                    notes = [data for data in listunspent if data['txid'] not in list_txs]
+                    if notes:
+                        await self.ingest_memos(notes)
 
                     if self.request_count > 0:
                         try:
@@ -2306,44 +2300,35 @@ class Messages(Box):
                     self.chat.run_tasks()
 
 
-    async def unhexlify_memo(self, data):
-        memo = data['memo']
-        amount = data['amount']
-        txid = data['txid']
-        try:
-            decoded_memo = binascii.unhexlify(memo)
-            form = decoded_memo.decode('utf-8')
-            clean_form = form.rstrip('\x00')
-            form_dict = json.loads(clean_form)
-            form_type = form_dict.get('type')
-
-            if form_type == "message":
-                await self.get_message(form_dict, amount)
-                self.storage.tx(txid)
-                self.message_count += 1
-            elif form_type == "request":
-                await self.get_request(form_dict)
-                self.storage.tx(txid)
-                self.request_count += 1
-
-        except (binascii.Error, json.decoder.JSONDecodeError) as e:
-            self.storage.tx(txid)
-            print(f"Received new transaction. Amount: {amount}")
-        except Exception as e:
-            self.storage.tx(txid)
-            print(f"Received new transaction. Amount: {amount}")
-
-
-    async def get_message(self, form, amount):
-        id = form.get('id')
-        author = form.get('username')
-        message = form.get('text')
-        timestamp = form.get('timestamp')
-        contacts_ids = self.storage.get_contacts("contact_id")
-        if id not in contacts_ids:
-            return
-        self.storage.unread_message(id, author, message, amount, timestamp)
-        self.chat.processed_timestamps.add(timestamp)
+    async def ingest_memos(self, notes):
+        contacts_ids = set(await self.async_storage.get_contacts("contact_id"))
+        txids = []
+        unread_messages = []
+        for data in notes:
+            txids.append(data['txid'])
+            form = self.chat.unhexlify_memo(data['memo'])
+            if form is None:
+                print(f"Received new transaction. Amount: {data['amount']}")
+                continue
+            form_type = form.get('type')
+            try:
+                if form_type == "identity":
+                    await self.chat.get_identity(form)
+                    contacts_ids = set(await self.async_storage.get_contacts("contact_id"))
+                elif form_type == "message":
+                    timestamp = form.get('timestamp')
+                    if form.get('id') in contacts_ids:
+                        unread_messages.append(
+                            (form.get('id'), form.get('username'), form.get('text'), data['amount'], timestamp)
+                        )
+                        self.chat.processed_timestamps.add(timestamp)
+                    self.message_count += 1
+                elif form_type == "request":
+                    await self.get_request(form)
+                    self.request_count += 1
+            except Exception as e:
+                print(f"Received new transaction. Amount: {data['amount']}")
+        await self.async_storage.save_memos(txids, (), unread_messages)
 
 
     async def get_request(self, form):
@@ -2351,10 +2336,10 @@ class Messages(Box):
         id = form.get('id')
         username = form.get('username')
         address = form.get('address')
-        banned = self.storage.get_banned()
+        banned = await self.async_storage.get_banned()
         if address in banned:
             return
-        self.storage.add_pending(category, id, username, address)
+        await self.async_storage.add_pending(category, id, username, address)
     
 
     def update_messages_mode(self, widget):
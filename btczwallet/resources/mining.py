@@ -144,9 +144,7 @@ class AddressesList(Window):
 
     async def get_transparent_addresses(self):
         addresses_data,_ = await self.commands.ListAddresses()
-        if addresses_data:
-            addresses_data = json.loads(addresses_data)
-        else:
+        if not addresses_data:
             addresses_data = []
         if addresses_data is not None:
             address_items = [(address_info, address_info) for address_info in addresses_data]
@@ -156,7 +154,6 @@ class AddressesList(Window):
 
     async def get_private_addresses(self):
         addresses_data,_ = await self.commands.z_listAddresses()
-        addresses_data = json.loads(addresses_data)
         if addresses_data:
             message_address = self.storage.get_identity("address")
             if message_address:
@@ -650,7 +647,7 @@ class Mining(Box):
 
     async def display_address_balance(self, widget):
         balance, _ = await self.commands.z_getBalance(self.selected_address)
-        if balance:
+        if balance is not None:
             format_balance = self.units.format_balance(float(balance))
             self.address_balance.text = format_balance
 
@@ -1,6 +1,5 @@
 
 import asyncio
-import json
 from datetime import datetime, timezone
 import ipaddress
 import aiohttp
@@ -578,7 +577,6 @@ class Peer(Window):
 
             peerinfo, _ = await self.commands.getPeerinfo()
             if peerinfo:
-                peerinfo = json.loads(peerinfo)
                 current_addresses = set()
                 node_by_address = {}
 
@@ -59,6 +59,7 @@ class Notify(StatusIconGtk):
             self.main.position = self.main.position
             self.main.show()
             self.main._is_hidden = None
+            self.main.node_state.refresh()
 
 
     def exit_app(self, action):
@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+from toga import App, Window
+
+from .client import Client
+
+FINISHED_STATUSES = ("success", "failed", "cancelled")
+
+
+class Operation():
+    def __init__(self, opid, future, on_status):
+        super().__init__()
+
+        self.opid = opid
+        self.future = future
+        self.on_status = on_status
+        self.status = None
+        self.started = time.monotonic()
+
+
+
+class OperationTracker():
+    def __init__(self, app:App, main:Window, interval:int = 1):
+        super().__init__()
+
+        self.app = app
+        self.main = main
+        self.commands = Client(self.app)
+        self.interval = interval
+
+        self.operations = {}
+        self.task = None
+        self.completed = 0
+        self.total_latency = 0
+        self.max_latency = 0
+
+
+    def track(self, opid, on_status=None):
+        """
+        Returns a future of the operation's final z_getoperationresult entry.
+        'on_status(status)' is called whenever the reported status changes.
+        """
+        operation = self.operations.get(opid)
+        if operation is None:
+            future = asyncio.get_running_loop().create_future()
+            operation = Operation(opid, future, on_status)
+            self.operations[opid] = operation
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self.run())
+        return operation.future
+
+
+    async def wait(self, opid, on_status=None):
+        return await self.track(opid, on_status)
+
+
+    @property
+    def depth(self):
+        return len(self.operations)
+
+
+    def get_metrics(self):
+        average = self.total_latency / self.completed if self.completed else 0
+        return {
+            "depth": self.depth,
+            "completed": self.completed,
+            "average_latency": average,
+            "max_latency": self.max_latency
+        }
+
+
+    async def run(self):
+        while self.operations:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception as e:
+                print(f"Error while tracking operations: {e}")
+
+
+    async def poll(self):
+        statuses, _= await self.commands.z_getOperationStatus(list(self.operations))
+        if statuses is None:
+            return
+        reported = set()
+        finished = []
+        for data in statuses:
+            operation = self.operations.get(data.get('id'))
+            if operation is None:
+                continue
+            reported.add(operation.opid)
+            status = data.get('status')
+            if status != operation.status:
+                operation.status = status
+                if operation.on_status:
+                    try:
+                        operation.on_status(status)
+                    except Exception as e:
+                        print(f"Error while updating operation status: {e}")
+            if status in FINISHED_STATUSES:
+                finished.append(operation.opid)
+        results = {}
+        if finished:
+            transaction_results, _= await self.commands.z_getOperationResult(finished)
+            for data in transaction_results or []:
+                results[data.get('id')] = data
+        for opid in list(self.operations):
+            if opid in results:
+                self.resolve(opid, results[opid])
+            elif opid in finished:
+                self.resolve(opid, {"id": opid, "status": self.operations[opid].status})
+            elif opid not in reported:
+                self.resolve(opid, {"id": opid, "status": "failed", "error": {"message": "Unknown operation"}})
+
+
+    def resolve(self, opid, result):
+        operation = self.operations.pop(opid)
+        latency = time.monotonic() - operation.started
+        self.completed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if not operation.future.done():
+            operation.future.set_result(result)
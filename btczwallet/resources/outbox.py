@@ -0,0 +1,98 @@
+import asyncio
+
+from toga import App, Window
+
+from .client import Client
+
+FLUSH_WINDOW = 2
+MAX_OUTPUTS = 54
+
+
+class OutgoingMemo():
+    def __init__(self, toaddress, amount, txfee, memo, future):
+        super().__init__()
+
+        self.toaddress = toaddress
+        self.amount = amount
+        self.txfee = txfee
+        self.memo = memo
+        self.future = future
+
+
+
+class Outbox():
+    def __init__(self, app:App, main:Window, window:float = FLUSH_WINDOW, max_outputs:int = MAX_OUTPUTS):
+        super().__init__()
+
+        self.app = app
+        self.main = main
+        self.commands = Client(self.app)
+        self.window = window
+        self.max_outputs = max_outputs
+
+        self.pending = {}
+        self.flush_task = None
+
+
+    def send(self, uaddress, toaddress, amount, txfee, memo):
+        """
+        Queues a memo and returns a future of the txid that carried it, None when sending failed.
+        Memos queued from the same address within the flush window share one z_sendmany.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.setdefault(uaddress, []).append(
+            OutgoingMemo(toaddress, amount, txfee, memo, future)
+        )
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.ensure_future(self.flush_pending())
+        return future
+
+
+    async def flush_pending(self):
+        await asyncio.sleep(self.window)
+        while self.pending:
+            await asyncio.gather(
+                *(self.flush(uaddress) for uaddress in list(self.pending))
+            )
+
+
+    def take_batch(self, uaddress):
+        """
+        Takes up to 'max_outputs' queued memos with distinct recipients, z_sendmany rejects duplicated addresses.
+        """
+        batch = []
+        remaining = []
+        recipients = set()
+        for item in self.pending.pop(uaddress, []):
+            if len(batch) < self.max_outputs and item.toaddress not in recipients:
+                recipients.add(item.toaddress)
+                batch.append(item)
+            else:
+                remaining.append(item)
+        if remaining:
+            self.pending[uaddress] = remaining
+        return batch
+
+
+    async def flush(self, uaddress):
+        batch = self.take_batch(uaddress)
+        if not batch:
+            return
+        txid = None
+        try:
+            operation, _= await self.commands.SendMemos(
+                uaddress,
+                [(item.toaddress, item.amount, item.memo) for item in batch],
+                max(item.txfee for item in batch)
+            )
+            if operation:
+                result = await self.main.operations.wait(operation)
+                if result.get('status') == "success":
+                    txid = result.get('result', {}).get('txid')
+                else:
+                    print(f"Error sending memos: {result.get('error', {}).get('message')}")
+        except Exception as e:
+            print(f"Error sending memos: {e}")
+        for item in batch:
+            if not item.future.done():
+                item.future.set_result(txid)
@@ -1,6 +1,5 @@
 
 import asyncio
-import json
 import webbrowser
 
 from toga import (
@@ -388,7 +387,6 @@ class Receive(Box):
 
     async def get_transparent_addresses(self):
         addresses_data,_ = await self.commands.ListAddresses()
-        addresses_data = json.loads(addresses_data)
         if addresses_data is not None:
             address_items = {address_info for address_info in addresses_data}
         else:
@@ -398,7 +396,6 @@ class Receive(Box):
 
     async def get_private_addresses(self):
         addresses_data,_ = await self.commands.z_listAddresses()
-        addresses_data = json.loads(addresses_data)
         if addresses_data:
             message_address = self.storage.get_identity("address")
             if message_address:
@@ -1,7 +1,4 @@
 
-import asyncio
-import json
-
 from toga import (
     App, Box, Label, TextInput, Selection, 
     ImageView, Window, Switch, MultilineTextInput,
@@ -695,9 +692,7 @@ class Send(Box):
 
     async def get_transparent_addresses(self):
         addresses_data, _ = await self.commands.ListAddresses()
-        if addresses_data:
-            addresses_data = json.loads(addresses_data)
-        else:
+        if not addresses_data:
             addresses_data = []
         if addresses_data is not None:
             address_items = [("Main Account")] + [(address_info, address_info) for address_info in addresses_data]
@@ -708,7 +703,6 @@ class Send(Box):
     
     async def get_private_addresses(self):
         addresses_data, _ = await self.commands.z_listAddresses()
-        addresses_data = json.loads(addresses_data)
         if addresses_data:
             message_address = self.storage.get_identity("address")
             if message_address:
@@ -732,7 +726,7 @@ class Send(Box):
             if self.many_option.value is False:
                 self.update_fees_option(True)
             balance, _ = await self.commands.z_getBalance(selected_address)
-            if balance:
+            if balance is not None:
                 format_balance = self.units.format_balance(float(balance))
                 self.address_balance.text = format_balance
 
@@ -741,9 +735,8 @@ class Send(Box):
             self.single_option.enabled = False
             self.many_option.enabled =False
             self.update_fees_option(False)
-            total_balances, _ = await self.commands.z_getTotalBalance()
-            if total_balances:
-                balances = json.loads(total_balances)
+            balances, _ = await self.commands.z_getTotalBalance()
+            if balances:
                 transparent = balances.get('transparent')
                 format_balance = self.units.format_balance(float(transparent))
                 self.address_balance.text = format_balance
@@ -828,7 +821,6 @@ class Send(Box):
 
     async def set_default_fee(self, widget):
         result, _= await self.commands.getInfo()
-        result = json.loads(result)
         if result is not None:
             paytxfee = result.get('paytxfee')
             relayfee = result.get('relayfee')
@@ -851,7 +843,6 @@ class Send(Box):
             self.is_valid.image = "images/notvalid.png"
             return
         if result is not None:
-            result = json.loads(result)
             is_valid = result.get('isvalid')
             if is_valid is True:
                 self.is_valid.image = "images/valid.png"
@@ -990,34 +981,7 @@ class Send(Box):
                     return
                 operation, _= await self.commands.z_sendMany(selected_address, destination_address, amount, txfee)
                 if operation:
-                    transaction_status, _= await self.commands.z_getOperationStatus(operation)
-                    transaction_status = json.loads(transaction_status)
-                    if isinstance(transaction_status, list) and transaction_status:
-                        status = transaction_status[0].get('status')
-                        self.operation_status.text = status
-                        if status == "executing" or status =="success":
-                            await asyncio.sleep(1)
-                            while True:
-                                transaction_result, _= await self.commands.z_getOperationResult(operation)
-                                transaction_result = json.loads(transaction_result)
-                                if isinstance(transaction_result, list) and transaction_result:
-                                    status = transaction_result[0].get('status')
-                                    self.operation_status.text = status
-                                    if status == "failed":
-                                        self.enable_send()
-                                        self.main.error_dialog(
-                                            title="Error",
-                                            message="Transaction failed."
-                                        )
-                                        return
-                                    self.enable_send()
-                                    self.main.info_dialog(
-                                        title="Success",
-                                        message="Transaction success"
-                                    )
-                                    await self.clear_inputs()
-                                    return
-                                await asyncio.sleep(3)
+                    await self.wait_operation(operation)
                 else:
                     self.enable_send()
                     self.main.error_dialog(
@@ -1056,34 +1020,7 @@ class Send(Box):
         try:
             operation, _= await self.commands.z_sendToManyAddresses(selected_address, destination_address)
             if operation:
-                transaction_status, _= await self.commands.z_getOperationStatus(operation)
-                transaction_status = json.loads(transaction_status)
-                if isinstance(transaction_status, list) and transaction_status:
-                    status = transaction_status[0].get('status')
-                    self.operation_status.text = status
-                    if status == "executing" or status =="success":
-                        await asyncio.sleep(1)
-                        while True:
-                            transaction_result, _= await self.commands.z_getOperationResult(operation)
-                            transaction_result = json.loads(transaction_result)
-                            if isinstance(transaction_result, list) and transaction_result:
-                                status = transaction_status[0].get('status')
-                                self.operation_status.text = status
-                                if status == "failed":
-                                    self.enable_send()
-                                    self.main.error_dialog(
-                                        title="Error",
-                                        message="Transaction failed."
-                                    )
-                                    return
-                                self.enable_send()
-                                self.main.info_dialog(
-                                    title="Success",
-                                    message="Transaction success"
-                                )
-                                await self.clear_inputs()
-                                return
-                            await asyncio.sleep(3)
+                await self.wait_operation(operation)
             else:
                 self.enable_send()
                 self.main.error_dialog(
@@ -1094,6 +1031,28 @@ class Send(Box):
             self.enable_send()
             print(f"An error occurred: {e}")
 
+
+
+    async def wait_operation(self, operation):
+        result = await self.main.operations.wait(operation, self.update_operation_status)
+        self.update_operation_status(result.get('status'))
+        self.enable_send()
+        if result.get('status') != "success":
+            self.main.error_dialog(
+                title="Error",
+                message="Transaction failed."
+            )
+            return
+        self.main.info_dialog(
+            title="Success",
+            message="Transaction success"
+        )
+        await self.clear_inputs()
+
+
+    def update_operation_status(self, status):
+        self.operation_status.text = status
+
     
     def disable_send(self):
         self.send_button.enabled = False
@@ -1,7 +1,6 @@
 
 import asyncio
 import subprocess
-import json
 from datetime import datetime
 import os
 import aiohttp
@@ -471,19 +470,15 @@ class BTCZSetup(Box):
     async def verify_sync_progress(self):
         tooltip_text = f"Seeds :"
         await asyncio.sleep(1)
-        blockchaininfo, _ = await self.commands.getBlockchainInfo()
-        if isinstance(blockchaininfo, str):
-            info = json.loads(blockchaininfo)
+        info, _ = await self.commands.getBlockchainInfo()
         if info is not None:
             sync = info.get('verificationprogress')
             sync_percentage = sync * 100
             if sync_percentage <= 99.95:
                 self.update_info_box()
                 while True:
-                    blockchaininfo, _ = await self.commands.getBlockchainInfo()
-                    if blockchaininfo:
-                        info = json.loads(blockchaininfo)
-                    else:
+                    info, _ = await self.commands.getBlockchainInfo()
+                    if not info:
                         self.node_status = False
                         self.app.exit()
                         return
@@ -500,7 +495,6 @@ class BTCZSetup(Box):
 
                     peerinfo, _ = await self.commands.getPeerinfo()
                     if peerinfo:
-                        peerinfo = json.loads(peerinfo)
                         for node in peerinfo:
                             address = node.get('addr')
                             bytesrecv = node.get('bytesrecv')
@@ -0,0 +1,196 @@
+import asyncio
+import time
+
+from toga import App, Window
+
+from .client import Client
+
+HEARTBEAT_INTERVAL = 60
+HIDDEN_FACTOR = 4
+
+
+class Subscriber():
+    def __init__(self, callback, keys):
+        super().__init__()
+
+        self.callback = callback
+        self.keys = set(keys)
+        self.task = None
+        self.pending = None
+
+
+
+class NodeState():
+    def __init__(self, app:App, main:Window, interval:int = 5):
+        super().__init__()
+
+        self.app = app
+        self.main = main
+        self.commands = Client(self.app)
+        self.interval = interval
+        self.min_interval = 1
+        self.timeout = None
+
+        self.snapshot = {}
+        self.subscribers = []
+        self.calls = {
+            "blockchaininfo": ("getblockchaininfo",),
+            "networksolps": ("getnetworksolps",),
+            "connectioncount": ("getconnectioncount",),
+            "deprecationinfo": ("getdeprecationinfo",),
+            "totalbalance": ("z_gettotalbalance",),
+            "unconfirmedbalance": ("getunconfirmedbalance",)
+        }
+        self.pages = {}
+        self.notify_keys = set()
+        self.last_polled = {}
+        self.refresh_keys = set()
+        self.refresh_event = asyncio.Event()
+
+
+    def track(self, key, method, *params, page=None, notify=None):
+        """
+        Adds an RPC call to the polled batch, its result is published under 'key'.
+        When 'page' is given the call slows down to a heartbeat while that page is not shown,
+        unless 'notify' is set because its subscribers raise notifications,
+        then it keeps the full rate while the window is shown and a heartbeat while it is hidden.
+        """
+        call = (method, *params)
+        self.pages[key] = page
+        if notify:
+            self.notify_keys.add(key)
+        else:
+            self.notify_keys.discard(key)
+        if self.calls.get(key) != call:
+            self.calls[key] = call
+            self.snapshot.pop(key, None)
+            self.last_polled.pop(key, None)
+            self.refresh()
+
+
+    def untrack(self, key):
+        self.calls.pop(key, None)
+        self.snapshot.pop(key, None)
+        self.pages.pop(key, None)
+        self.notify_keys.discard(key)
+        self.last_polled.pop(key, None)
+
+
+    def is_visible(self, page=None):
+        if self.main._is_hidden or self.main._is_minimized:
+            return False
+        if page is None:
+            return True
+        return page in self.main.pages.children
+
+
+    def get_interval(self, interval, page=None):
+        if self.is_visible(page):
+            return interval
+        return max(interval * HIDDEN_FACTOR, HEARTBEAT_INTERVAL)
+
+
+    async def wait(self, interval, page=None):
+        """
+        Sleeps 'interval' seconds, stretched while the window or 'page' is hidden.
+        """
+        start = time.monotonic()
+        while time.monotonic() - start < self.get_interval(interval, page):
+            await asyncio.sleep(1)
+
+
+    def subscribe(self, callback, *keys):
+        """
+        Calls 'callback(snapshot)' whenever one of 'keys' changes.
+        Values already known are delivered right away.
+        """
+        subscriber = Subscriber(callback, keys)
+        self.subscribers.append(subscriber)
+        if subscriber.keys & self.snapshot.keys():
+            self.dispatch(subscriber)
+        return subscriber
+
+
+    def unsubscribe(self, subscriber):
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+
+    def refresh(self, *keys):
+        """
+        Polls 'keys' on the next tick, or every tracked key when none are given.
+        Keys of hidden pages keep their own interval.
+        """
+        self.refresh_keys.update(keys or self.calls)
+        self.refresh_event.set()
+
+
+    def dispatch(self, subscriber):
+        if subscriber.task and not subscriber.task.done():
+            subscriber.pending = True
+            return
+        subscriber.pending = None
+        subscriber.task = asyncio.ensure_future(self.deliver(subscriber))
+
+
+    async def deliver(self, subscriber):
+        try:
+            result = subscriber.callback(self.snapshot)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            print(f"Error while updating node state subscriber: {e}")
+
+
+    async def update_node_state(self, widget):
+        while True:
+            if self.main.import_key_toggle:
+                await asyncio.sleep(1)
+                continue
+            self.refresh_event.clear()
+            forced, self.refresh_keys = self.refresh_keys, set()
+            await self.poll(forced)
+            try:
+                await asyncio.wait_for(self.refresh_event.wait(), self.timeout or self.interval)
+                await asyncio.sleep(self.min_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+    async def poll(self, forced=()):
+        now = time.monotonic()
+        keys = []
+        for key in self.calls:
+            if key in self.notify_keys:
+                page = None
+            else:
+                page = self.pages.get(key)
+            interval = self.get_interval(self.interval, page)
+            visible = self.is_visible(page)
+            if key in forced and visible:
+                keys.append(key)
+            elif now - self.last_polled.get(key, 0) >= interval - self.min_interval:
+                keys.append(key)
+        for key in keys:
+            self.last_polled[key] = now
+        results = []
+        if keys:
+            results = await self.commands.batch(
+                [self.calls[key] for key in keys]
+            )
+        changed = set()
+        for key, (result, _) in zip(keys, results):
+            if result is None:
+                continue
+            if self.snapshot.get(key) != result:
+                self.snapshot[key] = result
+                changed.add(key)
+        blockchaininfo = self.snapshot.get("blockchaininfo")
+        if blockchaininfo:
+            for key in ("blocks", "bestblockhash"):
+                if self.snapshot.get(key) != blockchaininfo.get(key):
+                    self.snapshot[key] = blockchaininfo.get(key)
+                    changed.add(key)
+        for subscriber in list(self.subscribers):
+            if subscriber.pending or subscriber.keys & changed:
+                self.dispatch(subscriber)
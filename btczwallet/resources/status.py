@@ -1,14 +1,11 @@
 
-import asyncio
 from datetime import datetime
-import json
 
 from toga import App, Window, Box
 from ..framework import StatusBar
 from toga.style.pack import Pack
 from toga.constants import ROW, BOTTOM
 
-from .client import Client
 from .utils import Utils
 
 
@@ -23,57 +20,43 @@ class AppStatusBar(Box):
         )
         self.app = app
         self.main = main
-        self.commands = Client(self.app)
         self.utils = Utils(self.app)
 
         self.statusbar = StatusBar()
         self._impl.native.pack_start(self.statusbar, True, True, 0)
 
-        self.app.add_background_task(self.update_status_bar)
-
-
-    async def update_status_bar(self, widget):
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            blockchaininfo, _ = await self.commands.getBlockchainInfo()
-            networksol, _ = await self.commands.getNetworkSolps()
-            connection_count,_ = await self.commands.getConnectionCount()
-            deprecationinfo, _ = await self.commands.getDeprecationInfo()
-            if blockchaininfo is not None:
-                if isinstance(blockchaininfo, str):
-                    info = json.loads(blockchaininfo)
-                if info is not None:
-                    blocks = info.get('blocks')
-                    sync = info.get('verificationprogress')
-                    mediantime = info.get('mediantime')
-                else:
-                    blocks = sync = mediantime = "N/A"
-            else:
-                blocks = sync = mediantime = "N/A"
-            if isinstance(mediantime, int):
-                mediantime_date = datetime.fromtimestamp(mediantime).strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                mediantime_date = "N/A"
-            bitcoinz_size = self.utils.get_bitcoinz_size()
-            sync_percentage = sync * 100
-            if networksol is not None:
-                if isinstance(networksol, str):
-                    info = json.loads(networksol)
-                if info is not None:
-                    netsol = info
-                else:
-                    netsol = "N/A"
-            if deprecationinfo is not None:
-                if isinstance(deprecationinfo, str):
-                    info = json.loads(deprecationinfo)
-                if info is not None:
-                    deprecation = info.get('deprecationheight')
-                else:
-                    deprecation = "N/A"
+        self.main.node_state.subscribe(
+            self.update_status_bar,
+            "blockchaininfo", "networksolps", "connectioncount", "deprecationinfo"
+        )
 
-            status_text = f"Blocks : {blocks} | Date : {mediantime_date} | Sync : {float(sync_percentage):.2f}% | NetHash : {netsol} Sol/s | Conns : {connection_count} | Dep : {deprecation} | Size : {int(bitcoinz_size)} MB"
-            self.statusbar.add(status_text)
 
-            await asyncio.sleep(5)
\ No newline at end of file
+    def update_status_bar(self, state):
+        blockchaininfo = state.get("blockchaininfo")
+        networksol = state.get("networksolps")
+        connection_count = state.get("connectioncount")
+        deprecationinfo = state.get("deprecationinfo")
+        if blockchaininfo is not None:
+            blocks = blockchaininfo.get('blocks')
+            sync = blockchaininfo.get('verificationprogress')
+            mediantime = blockchaininfo.get('mediantime')
+        else:
+            blocks = mediantime = "N/A"
+            sync = 0
+        if isinstance(mediantime, int):
+            mediantime_date = datetime.fromtimestamp(mediantime).strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            mediantime_date = "N/A"
+        bitcoinz_size = self.utils.get_bitcoinz_size()
+        sync_percentage = sync * 100
+        if networksol is not None:
+            netsol = networksol
+        else:
+            netsol = "N/A"
+        if deprecationinfo is not None:
+            deprecation = deprecationinfo.get('deprecationheight')
+        else:
+            deprecation = "N/A"
+
+        status_text = f"Blocks : {blocks} | Date : {mediantime_date} | Sync : {float(sync_percentage):.2f}% | NetHash : {netsol} Sol/s | Conns : {connection_count} | Dep : {deprecation} | Size : {int(bitcoinz_size)} MB"
+        self.statusbar.add(status_text)
@@ -1,13 +1,126 @@
 
+import asyncio
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 from toga import App
 
 messages_data = 'messages.dat'
+transactions_data = 'transactions.dat'
+
+transactions_order = {
+    "newest": "timereceived DESC",
+    "oldest": "timereceived ASC",
+    "largest": "ABS(amount) DESC",
+    "smallest": "ABS(amount) ASC"
+}
+
+# Each entry upgrades the schema by one version, the position in the list is the user_version it sets.
+# Never edit a released entry, append a new one instead.
+messages_migrations = [
+    '''
+    CREATE TABLE IF NOT EXISTS identity (
+        category TEXT,
+        username TEXT,
+        address TEXT
+    );
+    CREATE TABLE IF NOT EXISTS contacts (
+        category TEXT,
+        id TEXT,
+        contact_id TEXT,
+        username TEXT,
+        address TEXT
+    );
+    CREATE TABLE IF NOT EXISTS pending (
+        category TEXT,
+        id TEXT,
+        username TEXT,
+        address TEXT
+    );
+    CREATE TABLE IF NOT EXISTS txs (
+        txid TEXT
+    );
+    CREATE TABLE IF NOT EXISTS messages (
+        id TEXT,
+        author TEXT,
+        message TEXT,
+        amount REAL,
+        timestamp INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS unread_messages (
+        id TEXT,
+        author TEXT,
+        message TEXT,
+        amount REAL,
+        timestamp INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS key (
+        prv_key TEXT
+    );
+    CREATE TABLE IF NOT EXISTS requests (
+        id TEXT,
+        address TEXT
+    );
+    CREATE TABLE IF NOT EXISTS banned (
+        address TEXT
+    );
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS messages_id_timestamp
+    ON messages (id, timestamp);
+    CREATE INDEX IF NOT EXISTS unread_messages_id_timestamp
+    ON unread_messages (id, timestamp);
+    CREATE INDEX IF NOT EXISTS contacts_contact_id
+    ON contacts (contact_id);
+    CREATE INDEX IF NOT EXISTS contacts_address
+    ON contacts (address);
+    CREATE INDEX IF NOT EXISTS pending_address
+    ON pending (address);
+    CREATE INDEX IF NOT EXISTS txs_txid
+    ON txs (txid);
+    CREATE INDEX IF NOT EXISTS requests_address
+    ON requests (address);
+    CREATE INDEX IF NOT EXISTS banned_address
+    ON banned (address);
+    '''
+]
+
+transactions_migrations = [
+    '''
+    CREATE TABLE IF NOT EXISTS transactions (
+        txid TEXT,
+        vout INTEGER,
+        send INTEGER,
+        category TEXT,
+        address TEXT,
+        amount REAL,
+        timereceived INTEGER,
+        PRIMARY KEY (txid, vout, send)
+    );
+    CREATE INDEX IF NOT EXISTS transactions_timereceived
+    ON transactions (timereceived DESC);
+    CREATE INDEX IF NOT EXISTS transactions_category
+    ON transactions (category, timereceived DESC);
+    CREATE INDEX IF NOT EXISTS transactions_address
+    ON transactions (address, timereceived DESC);
+    CREATE INDEX IF NOT EXISTS transactions_amount
+    ON transactions (ABS(amount));
+    CREATE TABLE IF NOT EXISTS sync (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    '''
+]
 
 
 class Storage():
+    _local = threading.local()
+    _migrate_lock = threading.Lock()
+    migrations = messages_migrations
+
     def __init__(self, app:App):
         super().__init__()
 
@@ -16,541 +129,853 @@ class Storage():
         self.data_path = os.path.join(self.app_data, messages_data)
 
 
+    def connect(self, create = False):
+        """
+        Returns this thread's connection to messages.dat, opening it and migrating the schema on first use.
+        Without 'create', returns None while the file does not exist yet.
+        """
+        connections = getattr(Storage._local, "connections", None)
+        if connections is None:
+            connections = Storage._local.connections = {}
+        conn = connections.get(self.data_path)
+        if conn is None:
+            if not create and not os.path.exists(self.data_path):
+                return None
+            if not os.path.exists(self.app_data):
+                os.makedirs(self.app_data)
+            conn = sqlite3.connect(self.data_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with Storage._migrate_lock:
+                self.migrate(conn)
+            connections[self.data_path] = conn
+        return conn
+
+
+    def migrate(self, conn):
+        """
+        Applies the migrations newer than the file's user_version, each one in its own transaction.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, script in enumerate(self.migrations[version:], start=version + 1):
+            try:
+                conn.executescript(
+                    f"BEGIN;\n{script}\nPRAGMA user_version = {number};\nCOMMIT;"
+                )
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                print(f"Error migrating {os.path.basename(self.data_path)} to version {number}: {e}")
+                return
+
+
+    @contextmanager
+    def transaction(self):
+        """
+        Yields the connection inside a transaction, or inside the running write batch if there is one.
+        """
+        conn = self.connect(create=True)
+        if getattr(Storage._local, "batch", None):
+            yield conn
+            return
+        with conn:
+            yield conn
+
+
+    def execute(self, query, params = ()):
+        with self.transaction() as conn:
+            conn.execute(query, params)
+
+
+    def write_batch(self, calls):
+        """
+        Runs the (method, args) write calls in one transaction, a failing call is rolled back on its own.
+        'method' is a bound write method of this storage.
+        Returns a (result, error) pair per call.
+        """
+        conn = self.connect(create=True)
+        results = []
+        Storage._local.batch = True
+        try:
+            conn.execute("BEGIN")
+            for method, args in calls:
+                conn.execute("SAVEPOINT call")
+                try:
+                    results.append((method(*args), None))
+                    conn.execute("RELEASE call")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO call")
+                    conn.execute("RELEASE call")
+                    results.append((None, e))
+            conn.commit()
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            Storage._local.batch = None
+        return results
+
+
+    def fetchone(self, query, params = ()):
+        conn = self.connect()
+        if conn is None:
+            return None
+        return conn.execute(query, params).fetchone()
+
+
+    def fetchall(self, query, params = ()):
+        conn = self.connect()
+        if conn is None:
+            return []
+        return conn.execute(query, params).fetchall()
+
+
     def is_exists(self):
         if not os.path.exists(self.data_path):
             return False
         return self.data_path
+
+
+    def backup(self, backup_path):
+        conn = self.connect()
+        if conn is None:
+            return
+        backup = sqlite3.connect(backup_path)
+        conn.backup(backup)
+        backup.close()
     
     def identity(self, category, username, address):
-        self.create_identity_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO identity (category, username, address)
             VALUES (?, ?, ?)
             ''', 
             (category, username, address)
         )
-        conn.commit()
-        conn.close()
 
 
     def get_identity(self, option = None):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            if option == "category":
-                cursor.execute(
-                    "SELECT category FROM identity"
-                )
-                result = cursor.fetchone()
-            elif option == "username":
-                cursor.execute(
-                    "SELECT username FROM identity"
-                )
-                result = cursor.fetchone()
-            elif option == "address":
-                cursor.execute(
-                    "SELECT address FROM identity"
-                )
-                result = cursor.fetchone()
-            elif option is None:
-                cursor.execute(
-                    "SELECT category, username, address FROM identity"
-                )
-                result = cursor.fetchone()
-            conn.close()
-            return result
-        except sqlite3.OperationalError:
-            return None
+        if option == "category":
+            return self.fetchone(
+                "SELECT category FROM identity"
+            )
+        elif option == "username":
+            return self.fetchone(
+                "SELECT username FROM identity"
+            )
+        elif option == "address":
+            return self.fetchone(
+                "SELECT address FROM identity"
+            )
+        elif option is None:
+            return self.fetchone(
+                "SELECT category, username, address FROM identity"
+            )
     
 
     def add_contact(self, category, id, contact_id, username, address):
-        self.create_contacts_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO contacts (category, id, contact_id, username, address)
             VALUES (?, ?, ?, ?, ?)
             ''',
             (category, id, contact_id, username, address)
         )
-        conn.commit()
-        conn.close()
 
 
     def add_pending(self, category, id, username, address):
-        self.create_pending_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO pending (category, id, username, address)
             VALUES (?, ?, ?, ?)
             ''',
             (category, id, username, address)
         )
-        conn.commit()
-        conn.close()
 
     def add_request(self, id, address):
-        self.create_requests_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO requests (id, address)
             VALUES (?, ?)
             ''',
             (id, address)
         )
-        conn.commit()
-        conn.close()
 
     def tx(self, txid):
-        self.create_txs_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO txs (txid)
             VALUES (?)
             ''', 
             (txid,)
         )
-        conn.commit()
-        conn.close()
 
     def key(self, prv_key):
-        self.create_key_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO key (prv_key)
             VALUES (?)
             ''', 
             (prv_key,)
         )
-        conn.commit()
-        conn.close()
 
     def message(self, id, author, message, amount, timestamp):
-        self.create_messages_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO messages (id, author, message, amount, timestamp)
             VALUES (?, ?, ?, ?, ?)
             ''', 
             (id, author, message, amount, timestamp)
         )
-        conn.commit()
-        conn.close()
 
 
     def unread_message(self, id, author, message, amount, timestamp):
-        self.create_unread_messages_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO unread_messages (id, author, message, amount, timestamp)
             VALUES (?, ?, ?, ?, ?)
             ''', 
             (id, author, message, amount, timestamp)
         )
-        conn.commit()
-        conn.close()
 
 
     def ban(self, address):
-        self.create_banned_table()
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             INSERT INTO banned (address)
             VALUES (?)
             ''', 
             (address,)
         )
-        conn.commit()
-        conn.close()
 
 
     def get_contacts(self, option = None):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            if option == "address":
-                cursor.execute('SELECT address FROM contacts')
-                contacts = [row[0] for row in cursor.fetchall()]
-            elif option == "contact_id":
-                cursor.execute('SELECT contact_id FROM contacts')
-                contacts = [row[0] for row in cursor.fetchall()]
-            elif option is None:
-                cursor.execute('SELECT * FROM contacts')
-                contacts = cursor.fetchall()
-            conn.close()
-            return contacts
-        except sqlite3.OperationalError:
-            return []
+        if option == "address":
+            return [row[0] for row in self.fetchall('SELECT address FROM contacts')]
+        elif option == "contact_id":
+            return [row[0] for row in self.fetchall('SELECT contact_id FROM contacts')]
+        elif option is None:
+            return self.fetchall('SELECT * FROM contacts')
         
 
+    def get_contacts_summary(self):
+        """
+        Returns every contact row with its unread messages count appended.
+        """
+        return self.fetchall(
+            '''
+            SELECT category, id, contact_id, username, address,
+                (SELECT COUNT(*) FROM unread_messages WHERE unread_messages.id = contacts.contact_id)
+            FROM contacts
+            '''
+        )
+
+
     def get_contact_username(self, contact_id):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT username FROM contacts WHERE contact_id = ?',
-                (contact_id,)
-            )
-            contact = cursor.fetchone()
-            conn.close()
-            return contact
-        except sqlite3.OperationalError:
-            return None
+        return self.fetchone(
+            'SELECT username FROM contacts WHERE contact_id = ?',
+            (contact_id,)
+        )
         
     
     def get_id_contact(self, contact_id):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT id FROM contacts WHERE contact_id = ?',
-                (contact_id,)
-            )
-            id = cursor.fetchone()
-            conn.close()
-            return id
-        except sqlite3.OperationalError:
-            return None
+        return self.fetchone(
+            'SELECT id FROM contacts WHERE contact_id = ?',
+            (contact_id,)
+        )
         
 
     def get_pending(self, option = None):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            if option == "address":
-                cursor.execute("SELECT address FROM pending")
-                contacts = [row[0] for row in cursor.fetchall()]
-            elif option is None:
-                cursor.execute('SELECT * FROM pending')
-                contacts = cursor.fetchall()
-            conn.close()
-            return contacts
-        except sqlite3.OperationalError:
-            return []
+        if option == "address":
+            return [row[0] for row in self.fetchall("SELECT address FROM pending")]
+        elif option is None:
+            return self.fetchall('SELECT * FROM pending')
         
 
     def get_requests(self):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT address FROM requests')
-            txs = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            return txs
-        except sqlite3.OperationalError:
-            return []
+        return [row[0] for row in self.fetchall('SELECT address FROM requests')]
         
         
     def get_request(self, address):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT id FROM requests WHERE address = ?',
-                (address,)
-            )
-            request = cursor.fetchone()
-            conn.close()
-            return request
-        except sqlite3.OperationalError:
-            return None
+        return self.fetchone(
+            'SELECT id FROM requests WHERE address = ?',
+            (address,)
+        )
         
 
     def get_txs(self):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT txid FROM txs')
-            txs = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            return txs
-        except sqlite3.OperationalError:
-            return []
+        return [row[0] for row in self.fetchall('SELECT txid FROM txs')]
+
+
+    def get_known_txs(self, txids):
+        """
+        Returns the subset of 'txids' that is already stored.
+        """
+        txids = list(txids)
+        known = set()
+        for i in range(0, len(txids), 500):
+            chunk = txids[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            known.update(
+                row[0] for row in self.fetchall(
+                    f'SELECT txid FROM txs WHERE txid IN ({placeholders})',
+                    chunk
+                )
+            )
+        return known
         
     
     def get_messages(self, contact_id):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT author, message, amount, timestamp FROM messages WHERE id = ?',
-                (contact_id,)
-            )
-            messages = cursor.fetchall()
-            conn.close()
-            return messages
-        except sqlite3.OperationalError:
-            return []
+        return self.fetchall(
+            'SELECT author, message, amount, timestamp FROM messages WHERE id = ?',
+            (contact_id,)
+        )
         
 
     def get_unread_messages(self, contact_id):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT author, message, amount, timestamp FROM unread_messages WHERE id = ?',
-                (contact_id,)
+        return self.fetchall(
+            'SELECT author, message, amount, timestamp FROM unread_messages WHERE id = ?',
+            (contact_id,)
+        )
+
+
+    def get_last_message_rowid(self, contact_id):
+        result = self.fetchone(
+            'SELECT MAX(rowid) FROM messages WHERE id = ?',
+            (contact_id,)
+        )
+        if result and result[0] is not None:
+            return result[0]
+        return 0
+
+
+    def get_messages_after(self, contact_id, rowid):
+        """
+        Returns the messages stored after 'rowid' as (rowid, author, message, amount, timestamp), in insertion order.
+        """
+        return self.fetchall(
+            '''
+            SELECT rowid, author, message, amount, timestamp FROM messages
+            WHERE id = ? AND rowid > ?
+            ORDER BY rowid
+            ''',
+            (contact_id, rowid)
+        )
+
+
+    def get_messages_before(self, contact_id, cursor, limit):
+        """
+        Returns up to 'limit' messages older than the (timestamp, rowid) 'cursor' (or the latest when None),
+        newest first, as (author, message, amount, timestamp, rowid).
+        """
+        if cursor is None:
+            return self.fetchall(
+                '''
+                SELECT author, message, amount, timestamp, rowid FROM messages
+                WHERE id = ?
+                ORDER BY timestamp DESC, rowid DESC LIMIT ?
+                ''',
+                (contact_id, limit)
             )
-            messages = cursor.fetchall()
-            conn.close()
-            return messages
-        except sqlite3.OperationalError:
-            return []
+        return self.fetchall(
+            '''
+            SELECT author, message, amount, timestamp, rowid FROM messages
+            WHERE id = ? AND (timestamp, rowid) < (?, ?)
+            ORDER BY timestamp DESC, rowid DESC LIMIT ?
+            ''',
+            (contact_id, *cursor, limit)
+        )
+
+
+    def get_messages_newer(self, contact_id, cursor, limit):
+        """
+        Returns up to 'limit' messages newer than the (timestamp, rowid) 'cursor', oldest first.
+        """
+        return self.fetchall(
+            '''
+            SELECT author, message, amount, timestamp, rowid FROM messages
+            WHERE id = ? AND (timestamp, rowid) > (?, ?)
+            ORDER BY timestamp ASC, rowid ASC LIMIT ?
+            ''',
+            (contact_id, *cursor, limit)
+        )
+
+
+    def get_unread_messages_after(self, contact_id, cursor, limit):
+        """
+        Returns up to 'limit' unread messages newer than the (timestamp, rowid) 'cursor' (or the oldest when None),
+        oldest first.
+        """
+        if cursor is None:
+            return self.fetchall(
+                '''
+                SELECT author, message, amount, timestamp, rowid FROM unread_messages
+                WHERE id = ?
+                ORDER BY timestamp ASC, rowid ASC LIMIT ?
+                ''',
+                (contact_id, limit)
+            )
+        return self.fetchall(
+            '''
+            SELECT author, message, amount, timestamp, rowid FROM unread_messages
+            WHERE id = ? AND (timestamp, rowid) > (?, ?)
+            ORDER BY timestamp ASC, rowid ASC LIMIT ?
+            ''',
+            (contact_id, *cursor, limit)
+        )
         
 
     def get_banned(self):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT address FROM banned')
-            txs = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            return txs
-        except sqlite3.OperationalError:
-            return []
+        return [row[0] for row in self.fetchall('SELECT address FROM banned')]
         
 
     def delete_pending(self, address):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                DELETE FROM pending WHERE address = ?
-                ''', 
-                (address,)
-            )
-            conn.commit()
-            conn.close()
-        except sqlite3.OperationalError as e:
-            print(f"Error deleting pending contact: {e}")
+        self.execute(
+            '''
+            DELETE FROM pending WHERE address = ?
+            ''', 
+            (address,)
+        )
 
 
     def delete_contact(self, address):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                DELETE FROM contacts WHERE address = ?
-                ''', 
-                (address,)
-            )
-            conn.commit()
-            conn.close()
-        except sqlite3.OperationalError as e:
-            print(f"Error deleting contact: {e}")
+        self.execute(
+            '''
+            DELETE FROM contacts WHERE address = ?
+            ''', 
+            (address,)
+        )
         
 
     def delete_request(self, address):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                DELETE FROM requests WHERE address = ?
-                ''', 
-                (address,)
-            )
-            conn.commit()
-            conn.close()
-        except sqlite3.OperationalError as e:
-            print(f"Error deleting request: {e}")
+        self.execute(
+            '''
+            DELETE FROM requests WHERE address = ?
+            ''', 
+            (address,)
+        )
 
 
     def delete_unread(self, contact_id):
-        try:
-            conn = sqlite3.connect(self.data_path)
-            cursor = conn.cursor()
-            cursor.execute(
+        self.execute(
+            '''
+            DELETE FROM unread_messages WHERE id = ?
+            ''', 
+            (contact_id,)
+        )
+
+
+    def read_unread(self, contact_id):
+        """
+        Moves the contact's unread messages to the messages table in one transaction.
+        """
+        with self.transaction() as conn:
+            conn.execute(
                 '''
-                DELETE FROM unread_messages WHERE id = ?
-                ''', 
+                INSERT INTO messages (id, author, message, amount, timestamp)
+                SELECT id, author, message, amount, timestamp FROM unread_messages
+                WHERE id = ?
+                ORDER BY timestamp
+                ''',
                 (contact_id,)
             )
-            conn.commit()
-            conn.close()
-        except sqlite3.OperationalError as e:
-            print(f"Error deleting request: {e}")
-
-
-    def create_identity_table(self):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS identity (
-                category TEXT,
-                username TEXT,
-                address TEXT
+            conn.execute(
+                'DELETE FROM unread_messages WHERE id = ?',
+                (contact_id,)
             )
-            '''
-        )
-        conn.commit()
-        conn.close()
 
 
     def edit_username(self, old_username, new_username):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             UPDATE identity
             SET username = ?
             WHERE username = ?
             ''', (new_username, old_username)
         )
-        conn.commit()
-        conn.close()
-
 
-    def create_contacts_table(self):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS contacts (
-                category TEXT,
-                id TEXT,
-                contact_id TEXT,
-                username TEXT,
-                address TEXT
-            )
-            '''
-        )
-        conn.commit()
-        conn.close()
 
     def update_contact_username(self, username, contact_id):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self.execute(
             '''
             UPDATE contacts
             SET username = ?
             WHERE contact_id = ?
             ''', (username, contact_id)
         )
-        conn.commit()
-        conn.close()
 
-    def create_pending_table(self):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS pending (
-                category TEXT,
-                id TEXT,
-                username TEXT,
-                address TEXT
-            )
-            '''
-        )
-        conn.commit()
-        conn.close()
 
-    def create_txs_table(self):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS txs (
-                txid TEXT
+    def save_memos(self, txids, messages = (), unread_messages = (), usernames = ()):
+        """
+        Stores a decoded batch of notes in one transaction.
+        'messages' and 'unread_messages' hold (id, author, message, amount, timestamp) rows,
+        'usernames' holds (username, contact_id) updates.
+        """
+        with self.transaction() as conn:
+            conn.executemany(
+                'INSERT INTO txs (txid) VALUES (?)',
+                [(txid,) for txid in txids]
             )
-            '''
+            conn.executemany(
+                '''
+                INSERT INTO messages (id, author, message, amount, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                messages
+            )
+            conn.executemany(
+                '''
+                INSERT INTO unread_messages (id, author, message, amount, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                unread_messages
+            )
+            conn.executemany(
+                'UPDATE contacts SET username = ? WHERE contact_id = ?',
+                usernames
+            )
+
+
+class AsyncStorage():
+    """
+    Runs a Storage off the event loop: reads on a thread pool, writes on a single writer thread.
+    Read methods are coroutines, write methods return a future of their result.
+    """
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-writer")
+    readers = ThreadPoolExecutor(max_workers=4, thread_name_prefix="storage-reader")
+
+    def __init__(self, storage:Storage):
+        super().__init__()
+
+        self.storage = storage
+        self.pending = []
+        self.last_write = None
+
+
+    async def _read(self, method, *args):
+        """
+        Runs the storage read 'method' on the reader pool, after any write queued before it.
+        """
+        if self.pending:
+            await self.pending[-1][2]
+        elif self.last_write and not self.last_write.done():
+            await asyncio.wait([self.last_write])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            AsyncStorage.readers, lambda: method(*args)
         )
-        conn.commit()
-        conn.close()
 
-    def create_messages_table(self):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS messages (
-                id TEXT,
-                author TEXT,
-                message TEXT,
-                amount REAL,
-                timestamp INTEGER
-            )
-            '''
+
+    def _write(self, method, *args):
+        """
+        Queues the storage write 'method' and returns a future of its result.
+        Writes queued within the same loop iteration are committed together.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((method, args, future))
+        if len(self.pending) == 1:
+            loop.call_soon(self.flush)
+        return future
+
+
+    def flush(self):
+        batch, self.pending = self.pending, []
+        loop = asyncio.get_running_loop()
+        self.last_write = loop.run_in_executor(
+            AsyncStorage.writer, self.storage.write_batch, [(method, args) for method, args, _ in batch]
         )
-        conn.commit()
-        conn.close()
+        self.last_write.add_done_callback(lambda task: self.resolve(batch, task))
 
-    def create_unread_messages_table(self):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS unread_messages (
-                id TEXT,
-                author TEXT,
-                message TEXT,
-                amount REAL,
-                timestamp INTEGER
-            )
-            '''
+
+    def resolve(self, batch, task):
+        try:
+            results = task.result()
+        except Exception as e:
+            print(f"Error writing to {os.path.basename(self.storage.data_path)}: {e}")
+            results = [(None, e)] * len(batch)
+        for (method, _, future), (result, error) in zip(batch, results):
+            if error is not None:
+                print(f"Error in storage {method.__name__}: {error}")
+            if not future.done():
+                future.set_result(result)
+
+
+    async def get_identity(self, option = None):
+        return await self._read(self.storage.get_identity, option)
+
+
+    async def get_contacts(self, option = None):
+        return await self._read(self.storage.get_contacts, option)
+
+
+    async def get_contacts_summary(self):
+        return await self._read(self.storage.get_contacts_summary)
+
+
+    async def get_contact_username(self, contact_id):
+        return await self._read(self.storage.get_contact_username, contact_id)
+
+
+    async def get_request(self, address):
+        return await self._read(self.storage.get_request, address)
+
+
+    async def get_known_txs(self, txids):
+        return await self._read(self.storage.get_known_txs, txids)
+
+
+    async def get_banned(self):
+        return await self._read(self.storage.get_banned)
+
+
+    async def get_unread_messages(self, contact_id):
+        return await self._read(self.storage.get_unread_messages, contact_id)
+
+
+    async def get_last_message_rowid(self, contact_id):
+        return await self._read(self.storage.get_last_message_rowid, contact_id)
+
+
+    async def get_messages_after(self, contact_id, rowid):
+        return await self._read(self.storage.get_messages_after, contact_id, rowid)
+
+
+    async def get_messages_before(self, contact_id, cursor, limit):
+        return await self._read(self.storage.get_messages_before, contact_id, cursor, limit)
+
+
+    async def get_messages_newer(self, contact_id, cursor, limit):
+        return await self._read(self.storage.get_messages_newer, contact_id, cursor, limit)
+
+
+    async def get_unread_messages_after(self, contact_id, cursor, limit):
+        return await self._read(self.storage.get_unread_messages_after, contact_id, cursor, limit)
+
+
+    def add_contact(self, category, id, contact_id, username, address):
+        return self._write(self.storage.add_contact, category, id, contact_id, username, address)
+
+
+    def add_pending(self, category, id, username, address):
+        return self._write(self.storage.add_pending, category, id, username, address)
+
+
+    def add_request(self, id, address):
+        return self._write(self.storage.add_request, id, address)
+
+
+    def tx(self, txid):
+        return self._write(self.storage.tx, txid)
+
+
+    def message(self, id, author, message, amount, timestamp):
+        return self._write(self.storage.message, id, author, message, amount, timestamp)
+
+
+    def ban(self, address):
+        return self._write(self.storage.ban, address)
+
+
+    def delete_pending(self, address):
+        return self._write(self.storage.delete_pending, address)
+
+
+    def delete_contact(self, address):
+        return self._write(self.storage.delete_contact, address)
+
+
+    def delete_request(self, address):
+        return self._write(self.storage.delete_request, address)
+
+
+    def read_unread(self, contact_id):
+        return self._write(self.storage.read_unread, contact_id)
+
+
+    def save_memos(self, txids, messages = (), unread_messages = (), usernames = ()):
+        return self._write(self.storage.save_memos, txids, messages, unread_messages, usernames)
+
+
+
+class AsyncTxStorage(AsyncStorage):
+    def save_transactions(self, transactions, removed, lastblock):
+        return self._write(self.storage.save_transactions, transactions, removed, lastblock)
+
+
+
+class TxStorage(Storage):
+    migrations = transactions_migrations
+
+    def __init__(self, app:App):
+        super().__init__(app)
+
+        self.data_path = os.path.join(self.app_data, transactions_data)
+
+
+    def get_cursor(self):
+        result = self.fetchone(
+            "SELECT value FROM sync WHERE key = 'lastblock'"
+        )
+        if result:
+            return result[0]
+        return None
+
+
+    def transactions_filter(self, filters):
+        conditions = []
+        params = []
+        filters = filters or {}
+        if filters.get("category"):
+            conditions.append("category = ?")
+            params.append(filters["category"])
+        if filters.get("text"):
+            prefix = "".join(
+                f"[{char}]" if char in "*?[" else char for char in filters["text"]
+            ) + "*"
+            conditions.append("(address GLOB ? OR txid GLOB ?)")
+            params.extend([prefix, prefix])
+        if filters.get("min_amount") is not None:
+            conditions.append("ABS(amount) >= ?")
+            params.append(filters["min_amount"])
+        if filters.get("max_amount") is not None:
+            conditions.append("ABS(amount) <= ?")
+            params.append(filters["max_amount"])
+        if filters.get("start_time") is not None:
+            conditions.append("timereceived >= ?")
+            params.append(filters["start_time"])
+        if filters.get("end_time") is not None:
+            conditions.append("timereceived < ?")
+            params.append(filters["end_time"])
+        if conditions:
+            return "WHERE " + " AND ".join(conditions), params
+        return "", params
+
+
+    def get_transactions(self, limit, offset = 0, filters = None, order = "newest"):
+        """
+        Returns a page of cached transactions, optionally narrowed by 'filters':
+        category, text (address or txid prefix), min_amount, max_amount, start_time and end_time.
+        """
+        where, params = self.transactions_filter(filters)
+        return self.fetchall(
+            f'''
+            SELECT txid, vout, send, category, address, amount, timereceived
+            FROM transactions
+            {where}
+            ORDER BY {transactions_order.get(order, transactions_order["newest"])}
+            LIMIT ? OFFSET ?
+            ''',
+            (*params, limit, offset)
         )
-        conn.commit()
-        conn.close()
 
-    def create_key_table(self):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS key (
-                prv_key TEXT
-            )
-            '''
+
+    def count_transactions(self, filters = None):
+        where, params = self.transactions_filter(filters)
+        result = self.fetchone(
+            f'SELECT COUNT(*) FROM transactions {where}',
+            params
         )
-        conn.commit()
-        conn.close()
+        if result:
+            return result[0]
+        return 0
 
-    def create_requests_table(self):
+
+    def iter_transactions(self, filters = None, order = "newest", size = 1000):
+        """
+        Yields cached transactions one by one, reading 'size' rows at a time on a separate connection.
+        """
+        where, params = self.transactions_filter(filters)
+        if not os.path.exists(self.data_path):
+            return
         conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS requests (
-                id TEXT,
-                address TEXT
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f'''
+                SELECT txid, vout, send, category, address, amount, timereceived
+                FROM transactions
+                {where}
+                ORDER BY {transactions_order.get(order, transactions_order["newest"])}
+                ''',
+                params
             )
-            '''
-        )
-        conn.commit()
-        conn.close()
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
 
-    def create_banned_table(self):
-        conn = sqlite3.connect(self.data_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            '''
-            CREATE TABLE IF NOT EXISTS banned (
-                address TEXT
+
+    def save_transactions(self, transactions, removed, lastblock):
+        """
+        Upserts (key, values) entries, where values is (category, address, amount, timereceived),
+        deletes 'removed' keys and stores the sync cursor in one transaction.
+        Returns the saved entries that were new or changed, as (key, values, is_new).
+        """
+        with self.transaction() as conn:
+            conn.executemany(
+                'DELETE FROM transactions WHERE txid = ? AND vout = ? AND send = ?',
+                removed
             )
-            '''
+            conn.execute(
+                '''
+                CREATE TEMP TABLE IF NOT EXISTS incoming (
+                    txid TEXT,
+                    vout INTEGER,
+                    send INTEGER,
+                    category TEXT,
+                    address TEXT,
+                    amount REAL,
+                    timereceived INTEGER,
+                    PRIMARY KEY (txid, vout, send)
+                )
+                '''
+            )
+            conn.execute('DELETE FROM incoming')
+            conn.executemany(
+                'INSERT OR REPLACE INTO incoming VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(*key, *values) for key, values in transactions]
+            )
+            changed = conn.execute(
+                '''
+                SELECT i.txid, i.vout, i.send, i.category, i.address, i.amount, i.timereceived,
+                t.txid IS NULL
+                FROM incoming AS i
+                LEFT JOIN transactions AS t
+                ON t.txid = i.txid AND t.vout = i.vout AND t.send = i.send
+                WHERE t.txid IS NULL
+                OR t.category IS NOT i.category
+                OR t.address IS NOT i.address
+                OR t.amount IS NOT i.amount
+                OR t.timereceived IS NOT i.timereceived
+                '''
+            ).fetchall()
+            conn.executemany(
+                '''
+                INSERT INTO transactions
+                (txid, vout, send, category, address, amount, timereceived)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (txid, vout, send) DO UPDATE SET
+                category = excluded.category,
+                address = excluded.address,
+                amount = excluded.amount,
+                timereceived = excluded.timereceived
+                ''',
+                [row[:7] for row in changed]
+            )
+            conn.execute('DELETE FROM incoming')
+            conn.execute(
+                "INSERT OR REPLACE INTO sync (key, value) VALUES ('lastblock', ?)",
+                (lastblock,)
+            )
+        return [(row[:3], row[3:7], bool(row[7])) for row in changed]
+
+
+    def clear_cursor(self):
+        self.execute(
+            "DELETE FROM sync WHERE key = 'lastblock'"
         )
-        conn.commit()
-        conn.close()
\ No newline at end of file
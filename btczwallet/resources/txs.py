@@ -1,14 +1,18 @@
 
 import asyncio
 import operator
+import os
+import io
+import csv
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 import webbrowser
 import time
 from functools import partial
+from collections import OrderedDict
 
-from toga import App, Box, Label, Window, Button, Table
-from ..framework import Gdk, ClipBoard, is_wsl, Menu, Command
+from toga import App, Box, Label, Window, Button, Selection, TextInput, ProgressBar
+from ..framework import Gdk, ClipBoard, is_wsl, Menu, Command, TableView
 from toga.style.pack import Pack
 from toga.colors import GRAY, GREEN, RED, ORANGE, BLACK, WHITE, TRANSPARENT
 from toga.constants import COLUMN, CENTER, BOLD, ROW, LEFT
@@ -17,6 +21,7 @@ from .client import Client
 from .utils import Utils
 from .units import Units
 from .settings import Settings
+from .storage import TxStorage, AsyncTxStorage
 
 if not is_wsl():
     from ..framework import NotifyGtk
@@ -194,6 +199,9 @@ class Txid(Window):
             self.amount_value
         )
 
+        transaction_info = self.transactions.get_cached_details(self.txid)
+        if transaction_info:
+            self.set_transaction_info(transaction_info)
         self.app.add_background_task(self.update_transaction_info)
 
 
@@ -203,26 +211,32 @@ class Txid(Window):
             while True:
                 if not self.updating_txid:
                     return
-                transaction_info, _= await self.commands.getTransaction(self.txid)
-                if isinstance(transaction_info, str):
-                    transaction_info = json.loads(transaction_info)
+                transaction_info = self.transactions.get_cached_details(self.txid, fresh=True)
+                if not transaction_info:
+                    transaction_info, _= await self.commands.getTransaction(self.txid)
+                    if transaction_info:
+                        self.transactions.cache_details(self.txid, transaction_info)
                 if transaction_info:
-                    category = transaction_info['details'][0]['category']
-                    amount = self.units.format_balance(float(transaction_info['amount']))
-                    confirmations = transaction_info['confirmations']
-                    if confirmations <= 0:
-                        color = RED
-                    elif 1 <= confirmations < 6:
-                        color = ORANGE
-                    else:
-                        color = GREEN
-                    self.confirmations_value.style.color = color
-                    self.confirmations_value.text = confirmations
-                    self.category_value.text = category
-                    self.amount_value.text = amount
+                    self.set_transaction_info(transaction_info)
                 
                 await asyncio.sleep(5)
 
+
+    def set_transaction_info(self, transaction_info):
+        category = transaction_info['details'][0]['category']
+        amount = self.units.format_balance(float(transaction_info['amount']))
+        confirmations = transaction_info['confirmations']
+        if confirmations <= 0:
+            color = RED
+        elif 1 <= confirmations < 6:
+            color = ORANGE
+        else:
+            color = GREEN
+        self.confirmations_value.style.color = color
+        self.confirmations_value.text = confirmations
+        self.category_value.text = category
+        self.amount_value.text = amount
+
     
     def close_button_mouse_enter(self, sender, event):
         self.close_button.style.color = WHITE
@@ -257,31 +271,47 @@ class Transactions(Box):
         self.units = Units(self.app)
         self.clipboard = ClipBoard()
         self.settings = Settings(self.app)
+        self.tx_storage = TxStorage(self.app)
+        self.async_tx_storage = AsyncTxStorage(self.tx_storage)
 
         self.transactions_toggle = None
         self.no_transaction_toggle = None
-        self.transactions_data = []
+        self.transactions_index = {}
+        self.first_slot = 0
         self.last_click_time = 0
         self.double_click_threshold = 0.5
         self.double_click_handler = None
         self.transaction_info_toggle = None
 
         self.transactions_count = 49
-        self.transactions_from = 0
-
-        self.transactions_table = Table(
-            headings=["Category", "Address", "Amount", "Time", "Txid"],
-            accessors=["category", "address", "amount", "time", "txid"],
+        self.target_confirmations = 101
+        self.transactions_synced = None
+        self.transactions_filters = {}
+        self.transactions_order = "newest"
+        self.export_toggle = None
+        self.export_cancelled = None
+        self.details_cache = OrderedDict()
+        self.details_cache_size = 256
+        self.prefetch_toggle = None
+
+        self.transactions_table = Box(
             style=Pack(
-                flex = 1,
-                color = BLACK,
-                font_weight = BOLD
+                flex = 1
             )
         )
-        transactions_table_widgets = self.transactions_table._impl.native.get_child()
-        v_adjustment = transactions_table_widgets.get_vadjustment()
+        self.table_view = TableView(
+            headings=["Category", "Address", "Amount", "Time", "Txid"],
+            columns=[3, 4, 5, 6, 0],
+            formatters={
+                3: str.upper,
+                5: self.units.format_balance,
+                6: self.format_time
+            }
+        )
+        self.transactions_table._impl.native.pack_start(self.table_view, True, True, 0)
+        v_adjustment = self.table_view.get_vadjustment()
         v_adjustment.connect("value-changed", self.on_scroll_table)
-        transactions_table_widgets.connect("button-press-event", self.transactions_table_context_event)
+        self.table_view.treeview.connect("button-press-event", self.transactions_table_context_event)
 
         self.transactions_table_context_menu = Menu()
         self.copy_address_cmd = Command(
@@ -314,6 +344,128 @@ class Transactions(Box):
                 padding_top = 40
             )
         )
+        self.filter_box = Box(
+            style=Pack(
+                direction = ROW,
+                padding = (0,0,5,0)
+            )
+        )
+        self.category_selection = Selection(
+            items=[
+                {"category": "All"},
+                {"category": "RECEIVE"},
+                {"category": "SEND"},
+                {"category": "GENERATE"},
+                {"category": "IMMATURE"}
+            ],
+            accessor="category",
+            style=Pack(
+                font_weight = BOLD,
+                width = 110
+            )
+        )
+        self.search_input = TextInput(
+            placeholder="address / txid prefix",
+            style=Pack(
+                font_weight = BOLD,
+                flex = 2,
+                padding_left = 5
+            ),
+            on_confirm=self.search_button_click
+        )
+        self.min_amount_input = TextInput(
+            placeholder="min amount",
+            style=Pack(
+                text_align = CENTER,
+                font_weight = BOLD,
+                width = 95,
+                padding_left = 5
+            )
+        )
+        self.max_amount_input = TextInput(
+            placeholder="max amount",
+            style=Pack(
+                text_align = CENTER,
+                font_weight = BOLD,
+                width = 95,
+                padding_left = 5
+            )
+        )
+        self.start_date_input = TextInput(
+            placeholder="from YYYY-MM-DD",
+            style=Pack(
+                text_align = CENTER,
+                font_weight = BOLD,
+                width = 125,
+                padding_left = 5
+            )
+        )
+        self.end_date_input = TextInput(
+            placeholder="to YYYY-MM-DD",
+            style=Pack(
+                text_align = CENTER,
+                font_weight = BOLD,
+                width = 125,
+                padding_left = 5
+            )
+        )
+        self.order_selection = Selection(
+            items=[
+                {"order": "newest"},
+                {"order": "oldest"},
+                {"order": "largest"},
+                {"order": "smallest"}
+            ],
+            accessor="order",
+            style=Pack(
+                font_weight = BOLD,
+                width = 95,
+                padding_left = 5
+            )
+        )
+        self.search_button = Button(
+            text="Search",
+            style=Pack(
+                font_weight = BOLD,
+                padding_left = 5
+            ),
+            on_press=self.search_button_click
+        )
+        self.clear_search_button = Button(
+            text="Clear",
+            style=Pack(
+                font_weight = BOLD,
+                padding_left = 5
+            ),
+            on_press=self.clear_search_button_click
+        )
+        self.export_button = Button(
+            text="Export",
+            style=Pack(
+                font_weight = BOLD,
+                padding_left = 5
+            ),
+            on_press=self.export_button_click
+        )
+        self.export_progress = ProgressBar(
+            max=100,
+            style=Pack(
+                width = 80,
+                padding = (8,0,0,5)
+            )
+        )
+        self.filter_box.add(
+            self.category_selection,
+            self.search_input,
+            self.min_amount_input,
+            self.max_amount_input,
+            self.start_date_input,
+            self.end_date_input,
+            self.order_selection,
+            self.search_button,
+            self.clear_search_button,
+            self.export_button
+        )
         self.set_transactions_context_icons()
 
 
@@ -331,14 +483,169 @@ class Transactions(Box):
 
     async def insert_widgets(self, widget):
         if not self.transactions_toggle:
-            if self.transactions_data:
+            self.add(self.filter_box)
+            if self.table_view.rows:
                 self.add(self.transactions_table)
-                self.transactions_table.data = self.transactions_data
             else:
                 await self.no_transactions_found()
             self.transactions_toggle = True
 
 
+    def search_button_click(self, widget):
+        filters = {}
+        category = self.category_selection.value.category
+        if category != "All":
+            filters["category"] = category.lower()
+        if self.search_input.value.strip():
+            filters["text"] = self.search_input.value.strip()
+        try:
+            for key, amount_input in (
+                ("min_amount", self.min_amount_input),
+                ("max_amount", self.max_amount_input)
+            ):
+                if amount_input.value.strip():
+                    filters[key] = float(amount_input.value)
+        except ValueError:
+            self.main.error_dialog(
+                "Invalid Amount",
+                "The amount filter must be a number."
+            )
+            return
+        try:
+            if self.start_date_input.value.strip():
+                start_date = datetime.strptime(self.start_date_input.value.strip(), "%Y-%m-%d")
+                filters["start_time"] = int(start_date.timestamp())
+            if self.end_date_input.value.strip():
+                end_date = datetime.strptime(self.end_date_input.value.strip(), "%Y-%m-%d")
+                filters["end_time"] = int(end_date.timestamp()) + 86400
+        except ValueError:
+            self.main.error_dialog(
+                "Invalid Date",
+                "Dates must use the YYYY-MM-DD format."
+            )
+            return
+        self.transactions_filters = filters
+        self.transactions_order = self.order_selection.value.order
+        self.app.add_background_task(self.reload_rows)
+
+
+    def clear_search_button_click(self, button):
+        self.category_selection.value = self.category_selection.items[0]
+        self.order_selection.value = self.order_selection.items[0]
+        self.search_input.value = ""
+        self.min_amount_input.value = ""
+        self.max_amount_input.value = ""
+        self.start_date_input.value = ""
+        self.end_date_input.value = ""
+        self.transactions_filters = {}
+        self.transactions_order = "newest"
+        self.app.add_background_task(self.reload_rows)
+
+
+    def export_button_click(self, button):
+        def on_result(widget, result):
+            if result:
+                self.app.add_background_task(
+                    partial(self.export_transactions, str(result))
+                )
+        if self.export_toggle:
+            self.export_cancelled = True
+            return
+        self.main.save_file_dialog(
+            title="Export transactions to...",
+            suggested_filename="transactions.csv",
+            file_types=["csv", "json"],
+            on_result=on_result
+        )
+
+
+    def export_rows(self):
+        for txid, vout, _, category, address, amount, timereceived in self.tx_storage.iter_transactions(
+            self.transactions_filters, self.transactions_order
+        ):
+            yield {
+                "txid": txid,
+                "vout": vout,
+                "category": category,
+                "address": address,
+                "amount": amount,
+                "time": datetime.fromtimestamp(timereceived, timezone.utc).isoformat(),
+                "timereceived": timereceived
+            }
+
+
+    def export_csv(self, rows):
+        buffer = io.StringIO()
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+    def export_json(self, rows):
+        separator = "[\n"
+        for row in rows:
+            yield separator + json.dumps(row)
+            separator = ",\n"
+        if separator == "[\n":
+            yield "[\n"
+        yield "\n]\n"
+
+
+    async def export_transactions(self, file_path, widget):
+        total = self.tx_storage.count_transactions(self.transactions_filters)
+        if os.path.splitext(file_path)[1].lower() == ".json":
+            chunks = self.export_json(self.export_rows())
+        else:
+            chunks = self.export_csv(self.export_rows())
+        self.export_toggle = True
+        self.export_cancelled = None
+        self.export_button.text = "Cancel"
+        self.export_progress.value = 0
+        self.filter_box.add(self.export_progress)
+        exported = 0
+        try:
+            with open(file_path, 'w', newline='') as file:
+                for chunk in chunks:
+                    file.write(chunk)
+                    exported += 1
+                    if exported % 2000 == 0:
+                        self.export_progress.value = min(100, exported * 100 / max(total, 1))
+                        await asyncio.sleep(0)
+                        if self.export_cancelled:
+                            break
+            chunks.close()
+            if self.export_cancelled:
+                os.remove(file_path)
+            else:
+                self.main.info_dialog(
+                    title="Export Successful!",
+                    message=f"{total} transactions have been exported to:\n{file_path}"
+                )
+        except OSError as e:
+            self.main.error_dialog(
+                "Export Failed",
+                f"Could not write the export file: {e}"
+            )
+        finally:
+            self.filter_box.remove(self.export_progress)
+            self.export_button.text = "Export"
+            self.export_toggle = None
+            self.export_cancelled = None
+
+
+    def get_stored_transactions(self, offset = 0):
+        return self.tx_storage.get_transactions(
+            self.transactions_count, offset,
+            self.transactions_filters, self.transactions_order
+        )
+
+
     def transactions_table_context_event(self, widget, event):
         if event.button == Gdk.BUTTON_PRIMARY:
             current_time = time.time()
@@ -355,7 +662,7 @@ class Transactions(Box):
     
 
     def copy_address(self, action):
-        address = self.transactions_table.selection.address
+        address = self.table_view.selection[4]
         self.clipboard.copy(address)
         self.main.info_dialog(
             title="Copied",
@@ -363,7 +670,7 @@ class Transactions(Box):
         )
 
     def copy_transaction_id(self, action):
-        txid = self.transactions_table.selection.txid
+        txid = self.table_view.selection[0]
         self.clipboard.copy(txid)
         self.main.info_dialog(
             title="Copied",
@@ -372,7 +679,7 @@ class Transactions(Box):
 
     def open_transaction_in_explorer(self, action):
         url = "https://explorer.btcz.rocks/tx/"
-        txid = self.transactions_table.selection.txid
+        txid = self.table_view.selection[0]
         transaction_url = url + txid
         webbrowser.open(transaction_url)
 
@@ -381,35 +688,101 @@ class Transactions(Box):
         vertical_position = adjustment.get_value()
         max_value = adjustment.get_upper() - adjustment.get_page_size()
         if vertical_position >= max_value:
-            self.transactions_from += 50
             self.app.add_background_task(self.get_transactions_archive)
+        self.prefetch_visible_details()
+
+
+    def get_cached_details(self, txid, fresh = False):
+        entry = self.details_cache.get(txid)
+        if entry is None:
+            return None
+        blocks, transaction_info = entry
+        if fresh and blocks != self.main.node_state.snapshot.get("blocks"):
+            return None
+        self.details_cache.move_to_end(txid)
+        return transaction_info
+
+
+    def cache_details(self, txid, transaction_info):
+        self.details_cache[txid] = (self.main.node_state.snapshot.get("blocks"), transaction_info)
+        self.details_cache.move_to_end(txid)
+        while len(self.details_cache) > self.details_cache_size:
+            self.details_cache.popitem(last=False)
+
+
+    def prefetch_visible_details(self, state = None):
+        if self.prefetch_toggle or not self.main.node_state.is_visible(self):
+            return
+        txids = [row[0] for row in self.table_view.visible_rows()]
+        if txids:
+            self.prefetch_toggle = True
+            self.app.add_background_task(partial(self.prefetch_visible, txids))
+
+
+    async def prefetch_visible(self, txids, widget):
+        try:
+            await self.prefetch_details(txids)
+        finally:
+            self.prefetch_toggle = None
+
+
+    async def prefetch_details(self, txids, widget = None):
+        pending = [
+            txid for txid in dict.fromkeys(txids)
+            if not self.get_cached_details(txid, fresh=True)
+        ]
+        if not pending:
+            return
+        results = await self.commands.batch(
+            [("gettransaction", txid) for txid in pending]
+        )
+        for txid, (transaction_info, _) in zip(pending, results):
+            if transaction_info:
+                self.cache_details(txid, transaction_info)
 
 
     def transactions_table_double_click(self, widget, event):
         if not self.transaction_info_toggle:
-            txid = self.transactions_table.selection.txid
+            txid = self.table_view.selection[0]
             self.transaction_info = Txid(self, txid)
             self.transaction_info.show()
             self.double_click_handler = False
             self.transaction_info_toggle = True
 
 
-    def create_rows(self, sorted_transactions):
-        for data in sorted_transactions:
-            address = data.get("address", "Shielded")
-            category = data["category"]
-            amount = self.units.format_balance(data["amount"])
-            timereceived = data["timereceived"]
-            formatted_timereceived = datetime.fromtimestamp(timereceived).strftime("%Y-%m-%d %H:%M:%S")
-            txid = data["txid"]
-            row = {
-                "category": category.upper(),
-                "address": address,
-                "amount": amount,
-                "time": formatted_timereceived,
-                "txid": txid
-            }
-            self.transactions_data.append(row)
+    def get_entry_key(self, data):
+        vout = data.get("vout")
+        if vout is None:
+            vout = -1
+        return (data["txid"], vout, int(data["category"] == "send"))
+
+
+    def create_row(self, data):
+        address = data.get("address", "Shielded")
+        return (data["category"], address, data["amount"], data["timereceived"])
+
+
+    def format_time(self, timereceived):
+        return datetime.fromtimestamp(timereceived).strftime("%Y-%m-%d %H:%M:%S")
+
+
+    def create_rows(self, stored_transactions, slot = 0):
+        rows = []
+        for row in stored_transactions:
+            key = row[:3]
+            if key in self.transactions_index:
+                continue
+            self.transactions_index[key] = slot
+            slot += 1
+            rows.append(row)
+        return rows
+
+
+    def get_row_index(self, key):
+        slot = self.transactions_index.get(key)
+        if slot is None:
+            return None
+        return slot - self.first_slot
 
 
     async def no_transactions_found(self):
@@ -418,62 +791,109 @@ class Transactions(Box):
 
 
     async def reload_transactions(self):
-        if self.transactions_data:
-            self.transactions_data.clear()
-        sorted_transactions = await self.get_transactions(
-            self.transactions_count,0
-        )
-        if sorted_transactions:
-            self.create_rows(sorted_transactions)
-            if self.no_transaction_toggle:
-                self.remove(self.no_transaction)
-                self.add(self.transactions_table)
-            else:
-                if self.transactions_toggle:
-                    self.transactions_table.data = self.transactions_data
+        self.tx_storage.clear_cursor()
+        self.transactions_synced = None
+        await self.sync_transactions(self.main.node_state.snapshot)
+
+
+    async def reload_rows(self, widget):
+        self.transactions_index.clear()
+        self.first_slot = 0
+        stored_transactions = self.get_stored_transactions()
+        self.table_view.rows = self.create_rows(stored_transactions)
+        if stored_transactions and self.no_transaction_toggle:
+            self.remove(self.no_transaction)
+            self.add(self.transactions_table)
+            self.no_transaction_toggle = None
 
 
     async def update_transactions(self, widget):
-        sorted_transactions = await self.get_transactions(
-            self.transactions_count,0
-        )
-        if sorted_transactions:
-            self.create_rows(sorted_transactions)
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            new_transactions = await self.get_transactions(self.transactions_count,0)
+        stored_transactions = self.get_stored_transactions()
+        self.table_view.rows = self.create_rows(stored_transactions)
+        self.main.node_state.track("walletinfo", "getwalletinfo", page=self, notify=True)
+        self.main.node_state.subscribe(
+            self.sync_transactions, "walletinfo", "bestblockhash"
+        )
+        self.main.node_state.subscribe(self.prefetch_visible_details, "blocks")
+
+
+    async def sync_transactions(self, state):
+        transactions_cursor = self.tx_storage.get_cursor()
+        result, error_message = await self.commands.listSinceBlock(
+            transactions_cursor or "", self.target_confirmations
+        )
+        if error_message or not result:
+            return
+        transactions = []
+        removed = [self.get_entry_key(data) for data in result.get("removed", [])]
+        for data in result.get("transactions", []):
+            if data.get("confirmations", 0) < 0:
+                removed.append(self.get_entry_key(data))
+            else:
+                transactions.append((self.get_entry_key(data), self.create_row(data)))
+        updates = await self.async_tx_storage.save_transactions(
+            transactions, removed, result.get("lastblock")
+        )
+        if updates is None:
+            return
+        self.apply_transactions(updates, removed)
+        self.transactions_synced = True
+
+
+    def apply_transactions(self, updates, removed):
+        for key in removed:
+            self.remove_transaction(key)
+        new_transactions = []
+        for key, values, is_new in updates:
+            row = (*key, *values)
+            if is_new:
+                new_transactions.append(row)
+            elif key in self.transactions_index:
+                self.update_transaction(key, row)
+        if not self.transactions_synced:
             if new_transactions:
-                for data in new_transactions:
-                    txid = data["txid"]
-                    if not any(tx["txid"] == txid for tx in self.transactions_data):
-                        address = data.get("address", "Shielded")
-                        category = data["category"]
-                        amount = self.units.format_balance(data["amount"])
-                        timereceived = data["timereceived"]
-                        formatted_timereceived = datetime.fromtimestamp(timereceived).strftime("%Y-%m-%d %H:%M:%S")
-                        row = {
-                            "category": category.upper(),
-                            "address": address,
-                            "amount": amount,
-                            "time": formatted_timereceived,
-                            "txid": txid
-                        }
-                        self.transactions_data.insert(0, row)
-                        self.add_transaction(0, row)
-                        if self.settings.notification_txs():
-                            try:
-                                notify = NotifyGtk(
-                                    title=f"[{category}] : {amount} BTCZ",
-                                    message=f"Txid : {txid}",
-                                    duration=10,
-                                    on_press=partial(self.on_notification_click, txid)
-                                )
-                                notify.popup()
-                            except Exception:
-                                pass
-            await asyncio.sleep(5)
+                self.app.add_background_task(self.reload_rows)
+            return
+        filtered = self.transactions_filters or self.transactions_order != "newest"
+        if filtered and new_transactions:
+            self.app.add_background_task(self.reload_rows)
+        new_transactions.sort(key=operator.itemgetter(6))
+        if new_transactions:
+            self.app.add_background_task(
+                partial(self.prefetch_details, [row[0] for row in new_transactions])
+            )
+        for row in new_transactions:
+            txid, _, _, category, _, amount, _ = row
+            if not filtered:
+                self.add_transaction(row)
+            if self.settings.notification_txs():
+                try:
+                    notify = NotifyGtk(
+                        title=f"[{category}] : {self.units.format_balance(amount)} BTCZ",
+                        message=f"Txid : {txid}",
+                        duration=10,
+                        on_press=partial(self.on_notification_click, txid)
+                    )
+                    notify.popup()
+                except Exception:
+                    pass
+
+
+    def update_transaction(self, key, row):
+        index = self.get_row_index(key)
+        if index is not None:
+            self.table_view.model.update(index, row)
+
+
+    def remove_transaction(self, key):
+        index = self.get_row_index(key)
+        if index is None:
+            return
+        removed_slot = self.transactions_index.pop(key)
+        for row_key, slot in self.transactions_index.items():
+            if slot > removed_slot:
+                self.transactions_index[row_key] = slot - 1
+        self.table_view.model.remove(index)
 
     
     def on_notification_click(self, txid):
@@ -483,54 +903,21 @@ class Transactions(Box):
             self.transaction_info_toggle = True
 
 
-    def add_transaction(self, index, row):
+    def add_transaction(self, row):
+        self.first_slot -= 1
+        self.transactions_index[row[:3]] = self.first_slot
+        self.table_view.model.insert(0, row)
         if self.no_transaction_toggle:
             self.remove(self.no_transaction)
             self.add(self.transactions_table)
-            self.transactions_table.data = self.transactions_data
             self.no_transaction_toggle = None
-        else:
-            if self.transactions_toggle and not self.no_transaction_toggle:
-                self.transactions_table.data.insert(index=index, data=row)
                 
 
-    async def get_transactions(self, count, tx_from):
-        transactions, _ = await self.commands.listTransactions(
-            count, tx_from
-        )
-        if isinstance(transactions, str):
-            transactions_data = json.loads(transactions)
-        if transactions_data:
-            sorted_transactions = sorted(
-                transactions_data,
-                key=operator.itemgetter('timereceived'),
-                reverse=True
-            )
-            return sorted_transactions
-        return None
-
-
     async def get_transactions_archive(self, widget):
-        sorted_transactions = await self.get_transactions(
-            self.transactions_count, self.transactions_from
-        )
-        if sorted_transactions:
-            for data in sorted_transactions:
-                address = data.get("address", "Shielded")
-                category = data["category"]
-                amount = self.units.format_balance(data["amount"])
-                timereceived = data["timereceived"]
-                formatted_timereceived = datetime.fromtimestamp(timereceived).strftime("%Y-%m-%d %H:%M:%S")
-                txid = data["txid"]
-                row = {
-                    'Category': category.upper(),
-                    'Address': address,
-                    'Amount': amount,
-                    'Time': formatted_timereceived,
-                    'Txid': txid,
-                }
-                last_index = len(self.transactions_table.data)
-                self.add_transaction(last_index, row)
+        stored_transactions = self.get_stored_transactions(len(self.table_view.rows))
+        if stored_transactions:
+            slot = self.first_slot + len(self.table_view.rows)
+            self.table_view.model.extend(self.create_rows(stored_transactions, slot))
     
 
     def update_transactions_mode(self, widget):
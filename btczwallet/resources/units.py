@@ -3,7 +3,6 @@ import string
 import secrets
 from decimal import Decimal
 from datetime import timedelta
-import json
 
 from toga import App
 
@@ -99,20 +98,18 @@ class Units():
         return remaining_days
     
     async def estimated_earn(self, period, hashrate):
-        blockchaininfo, _ = await self.commands.getBlockchainInfo()
+        results = await self.commands.batch(
+            [
+                "getblockchaininfo",
+                "getnetworksolps"
+            ]
+        )
+        (blockchaininfo, _), (networksol, _) = results
         if blockchaininfo is not None:
-            if isinstance(blockchaininfo, str):
-                info = json.loads(blockchaininfo)
-            if info is not None:
-                blocks = info.get('blocks')
-                difficulty = info.get('difficulty')
-        networksol, _ = await self.commands.getNetworkSolps()
+            blocks = blockchaininfo.get('blocks')
+            difficulty = blockchaininfo.get('difficulty')
         if networksol is not None:
-            if isinstance(networksol, str):
-                info = json.loads(networksol)
-            if info is not None:
-                netsol = info
-                net_hashrate = self.solution_to_hash(netsol)
+            net_hashrate = self.solution_to_hash(networksol)
 
             period_seconds = period * 3600
             block_time_seconds = difficulty * 2**32 / net_hashrate
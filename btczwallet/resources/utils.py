@@ -554,6 +554,8 @@ addnode=178.193.205.17:1989
 addnode=51.222.50.26:1989
 addnode=146.59.69.245:1989
 addnode=37.187.76.80:1989
+zmqpubhashblock=tcp://127.0.0.1:28332
+zmqpubhashtx=tcp://127.0.0.1:28332
 """
                 config_file.write(config_content)
         except Exception as e:
@@ -1,7 +1,6 @@
 
 import os
 import asyncio
-import json
 
 from toga import (
     App, Window, Box, Label, ImageView,
@@ -222,13 +221,15 @@ class Wallet(Box):
             self.private_value
         )
         self.app.add_background_task(self.get_node_version)
-        self.app.add_background_task(self.update_balances)
+        self.main.node_state.subscribe(
+            self.update_balances,
+            "totalbalance", "unconfirmedbalance"
+        )
 
 
     async def get_node_version(self, widget):
         result, _ = await self.commands.getInfo()
         if result:
-            result = json.loads(result)
             subversion = result.get('subversion')
             build = result.get('build')
             clean_version = subversion.strip('/')
@@ -241,42 +242,35 @@ class Wallet(Box):
             self.bitcoinz_version.text = f"Core : {formatted_version} | Build : {build_suffix}"
 
 
-    async def update_balances(self, widget):
-        while True:
-            if self.main.import_key_toggle:
-                await asyncio.sleep(1)
-                continue
-            totalbalances,_ = await self.commands.z_getTotalBalance()
-            if totalbalances is not None:
-                balances = json.loads(totalbalances)
-                totalbalance = self.units.format_balance(float(balances.get('total')))
-                transparentbalance = self.units.format_balance(float(balances.get('transparent')))
-                privatebalance = self.units.format_balance(float(balances.get('private')))
-                self.total_value.text = totalbalance
-                self.transparent_value.text = transparentbalance
-                self.private_value.text = privatebalance
-            unconfirmed_balance,_ = await self.commands.getUnconfirmedBalance()
-            if unconfirmed_balance is not None:
-                unconfirmed = self.units.format_balance(float(unconfirmed_balance))
-                if float(unconfirmed) > 0:
-                    if not self.unconfirmed_balance_toggle:
-                        self.insert(2, self.unconfirmed_box)
-                        self.unconfirmed_box.add(
-                            self.unconfirmed_label,
-                            self.unconfirmed_value
-                        )
-                        self.unconfirmed_balance_toggle = True
-                    self.unconfirmed_value.text = unconfirmed
-                else:
-                    if self.unconfirmed_balance_toggle:
-                        self.unconfirmed_box.remove(
-                            self.unconfirmed_label,
-                            self.unconfirmed_value
-                        )
-                        self.remove(self.unconfirmed_box)
-                        self.unconfirmed_balance_toggle = False
-                    
-            await asyncio.sleep(5)
+    def update_balances(self, state):
+        totalbalances = state.get("totalbalance")
+        unconfirmed_balance = state.get("unconfirmedbalance")
+        if totalbalances is not None:
+            totalbalance = self.units.format_balance(float(totalbalances.get('total')))
+            transparentbalance = self.units.format_balance(float(totalbalances.get('transparent')))
+            privatebalance = self.units.format_balance(float(totalbalances.get('private')))
+            self.total_value.text = totalbalance
+            self.transparent_value.text = transparentbalance
+            self.private_value.text = privatebalance
+        if unconfirmed_balance is not None:
+            unconfirmed = self.units.format_balance(float(unconfirmed_balance))
+            if float(unconfirmed) > 0:
+                if not self.unconfirmed_balance_toggle:
+                    self.insert(2, self.unconfirmed_box)
+                    self.unconfirmed_box.add(
+                        self.unconfirmed_label,
+                        self.unconfirmed_value
+                    )
+                    self.unconfirmed_balance_toggle = True
+                self.unconfirmed_value.text = unconfirmed
+            else:
+                if self.unconfirmed_balance_toggle:
+                    self.unconfirmed_box.remove(
+                        self.unconfirmed_label,
+                        self.unconfirmed_value
+                    )
+                    self.remove(self.unconfirmed_box)
+                    self.unconfirmed_balance_toggle = False
 
     
     def update_wallet_mode(self, widget):
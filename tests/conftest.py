@@ -0,0 +1,35 @@
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+
+try:
+    import toga
+except ImportError:
+    toga = types.ModuleType("toga")
+    toga.App = type("App", (), {})
+    sys.modules["toga"] = toga
+
+
+def load_storage():
+    # btczwallet.resources imports every page of the wallet, load storage.py on its own.
+    path = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "btczwallet", "resources", "storage.py"
+    )
+    spec = importlib.util.spec_from_file_location("btczwallet_storage", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def storage():
+    return load_storage()
+
+
+@pytest.fixture
+def app(tmp_path):
+    return types.SimpleNamespace(paths=types.SimpleNamespace(data=str(tmp_path)))
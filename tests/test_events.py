@@ -0,0 +1,68 @@
+import asyncio
+import types
+
+import pytest
+
+zmq = pytest.importorskip("zmq")
+
+
+class FakeNodeState():
+    def __init__(self):
+        self.timeout = None
+        self.refreshes = []
+
+    def refresh(self, *keys):
+        self.refreshes.append(keys)
+
+
+@pytest.fixture
+def node_events(tmp_path, monkeypatch):
+    from btczwallet.resources import events
+
+    monkeypatch.setattr(events, "SILENCE_TIMEOUT", 0.5)
+    monkeypatch.setattr(events, "TX_REFRESH_INTERVAL", 0.3)
+    paths = types.SimpleNamespace(
+        app=str(tmp_path), data=str(tmp_path / "data"), cache=str(tmp_path / "cache")
+    )
+    main = types.SimpleNamespace(node_state=FakeNodeState())
+    return events, events.NodeEvents(types.SimpleNamespace(paths=paths), main)
+
+
+def test_refreshes_on_local_publisher(node_events, monkeypatch):
+    events, node_events = node_events
+    node_state = node_events.main.node_state
+
+    async def run():
+        publisher = zmq.asyncio.Context.instance().socket(zmq.PUB)
+        publisher.setsockopt(zmq.LINGER, 0)
+        port = publisher.bind_to_random_port("tcp://127.0.0.1")
+        monkeypatch.setattr(
+            node_events, "get_endpoints",
+            lambda: {f"tcp://127.0.0.1:{port}": [b"hashblock", b"hashtx"]}
+        )
+        listener = asyncio.ensure_future(node_events.listen(None))
+        try:
+            await asyncio.sleep(0.2)
+            assert node_state.timeout is None
+
+            while not node_state.refreshes:
+                await publisher.send_multipart([b"hashblock", b"\x00" * 32, b"\x00" * 4])
+                await asyncio.sleep(0.05)
+            assert node_state.refreshes[0] == ()
+            assert node_state.timeout == events.FALLBACK_INTERVAL
+
+            node_state.refreshes.clear()
+            for _ in range(20):
+                await publisher.send_multipart([b"hashtx", b"\x00" * 32, b"\x00" * 4])
+            await asyncio.sleep(0.5)
+            assert 1 <= len(node_state.refreshes) <= 2
+            assert set(node_state.refreshes) == {events.WALLET_KEYS}
+
+            await asyncio.sleep(0.6)
+            assert node_state.timeout is None
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+            publisher.close()
+
+    asyncio.run(run())
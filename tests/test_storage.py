@@ -0,0 +1,164 @@
+import asyncio
+import os
+import sqlite3
+
+
+def user_version(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def table_names(path, kind="table"):
+    conn = sqlite3.connect(path)
+    try:
+        return {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = ?", (kind,)
+            )
+        }
+    finally:
+        conn.close()
+
+
+def create_file(path, script, version=0):
+    conn = sqlite3.connect(path)
+    conn.executescript(script)
+    conn.execute(f"PRAGMA user_version = {version}")
+    conn.commit()
+    conn.close()
+
+
+def test_new_messages_file(storage, app):
+    messages = storage.Storage(app)
+    assert messages.connect() is None
+    messages.connect(create=True)
+    assert user_version(messages.data_path) == len(storage.messages_migrations)
+    assert "messages_id_timestamp" in table_names(messages.data_path, "index")
+
+
+def test_legacy_unversioned_file(storage, app):
+    path = os.path.join(app.paths.data, storage.messages_data)
+    create_file(
+        path,
+        '''
+        CREATE TABLE identity (category TEXT, username TEXT, address TEXT);
+        CREATE TABLE messages (id TEXT, author TEXT, message TEXT, amount REAL, timestamp INTEGER);
+        INSERT INTO identity VALUES ('individual', 'alice', 'zs1alice');
+        INSERT INTO messages VALUES ('bob', 'bob', 'hello', 0.0001, 1700000000);
+        '''
+    )
+    messages = storage.Storage(app)
+    messages.connect()
+    assert user_version(path) == len(storage.messages_migrations)
+    assert {"contacts", "unread_messages", "banned"} <= table_names(path)
+    assert messages.fetchall("SELECT username FROM identity") == [("alice",)]
+    assert messages.fetchall("SELECT message FROM messages WHERE id = 'bob'") == [("hello",)]
+
+
+def test_v1_file_is_upgraded(storage, app):
+    path = os.path.join(app.paths.data, storage.messages_data)
+    create_file(path, storage.messages_migrations[0], version=1)
+    assert "messages_id_timestamp" not in table_names(path, "index")
+    storage.Storage(app).connect()
+    assert user_version(path) == len(storage.messages_migrations)
+    assert "messages_id_timestamp" in table_names(path, "index")
+
+
+def test_failing_migration_rolls_back(storage, app, monkeypatch, capsys):
+    monkeypatch.setattr(
+        storage.Storage, "migrations",
+        storage.messages_migrations + [
+            '''
+            CREATE TABLE drafts (id TEXT, message TEXT);
+            INSERT INTO missing_table VALUES (1);
+            '''
+        ]
+    )
+    messages = storage.Storage(app)
+    messages.connect(create=True)
+    assert user_version(messages.data_path) == len(storage.messages_migrations)
+    assert "drafts" not in table_names(messages.data_path)
+    assert "Error migrating" in capsys.readouterr().out
+
+
+def test_write_batch_isolates_failing_calls(storage, app):
+    messages = storage.Storage(app)
+    results = messages.write_batch([
+        (messages.tx, ("first",)),
+        (messages.tx, ()),
+        (messages.tx, ("second",)),
+    ])
+    assert results[0] == (None, None) and results[2] == (None, None)
+    assert isinstance(results[1][1], TypeError)
+    assert messages.fetchall("SELECT txid FROM txs") == [("first",), ("second",)]
+
+
+def test_read_unread_moves_messages(storage, app):
+    messages = storage.Storage(app)
+    messages.save_memos(
+        ["txid"], unread_messages=[
+            ("bob", "bob", "second", 0.0001, 20),
+            ("bob", "bob", "first", 0.0001, 10),
+        ]
+    )
+    messages.read_unread("bob")
+    assert messages.get_unread_messages("bob") == []
+    assert [row[2] for row in messages.get_messages_after("bob", 0)] == ["first", "second"]
+
+
+def test_async_storage_reads_after_queued_writes(storage, app):
+    async def run():
+        async_storage = storage.AsyncStorage(storage.Storage(app))
+        async_storage.tx("first")
+        async_storage.tx("second")
+        return await async_storage.get_known_txs(["first", "second", "third"])
+
+    assert set(asyncio.run(run())) == {"first", "second"}
+
+
+def test_message_pages_keep_equal_timestamps(storage, app):
+    messages = storage.Storage(app)
+    rows = [("bob", "bob", f"m{index}", 0.0001, 100 + index // 2) for index in range(6)]
+    messages.save_memos([], messages=rows, unread_messages=rows)
+
+    first = messages.get_messages_before("bob", None, 3)
+    second = messages.get_messages_before("bob", first[-1][3:5], 3)
+    assert [row[1] for row in first + second] == ["m5", "m4", "m3", "m2", "m1", "m0"]
+
+    newer = messages.get_messages_newer("bob", second[-1][3:5], 3)
+    assert [row[1] for row in newer] == ["m1", "m2", "m3"]
+
+    first = messages.get_unread_messages_after("bob", None, 3)
+    second = messages.get_unread_messages_after("bob", first[-1][3:5], 3)
+    assert [row[1] for row in first + second] == ["m0", "m1", "m2", "m3", "m4", "m5"]
+
+
+def test_save_transactions_returns_changes(storage, app):
+    transactions = storage.TxStorage(app)
+    first = (("a", 0, 0), ("receive", "addr", 1.5, 100))
+    second = (("b", -1, 1), ("send", "Shielded", -2.0, 200))
+    assert transactions.save_transactions([first, second], [], "block1") == [
+        (("a", 0, 0), ("receive", "addr", 1.5, 100), True),
+        (("b", -1, 1), ("send", "Shielded", -2.0, 200), True),
+    ]
+    changed = (("a", 0, 0), ("generate", "addr", 1.5, 100))
+    assert transactions.save_transactions([changed, second], [("b", -1, 1)], "block2") == [
+        (("a", 0, 0), ("generate", "addr", 1.5, 100), False),
+        (("b", -1, 1), ("send", "Shielded", -2.0, 200), True),
+    ]
+    assert transactions.save_transactions([changed], [], "block3") == []
+    assert transactions.count_transactions() == 2
+    assert transactions.get_cursor() == "block3"
+
+
+def test_async_save_transactions(storage, app):
+    async def run():
+        async_storage = storage.AsyncTxStorage(storage.TxStorage(app))
+        return await async_storage.save_transactions(
+            [(("a", 0, 0), ("receive", "addr", 1.5, 100))], [], "block"
+        )
+
+    assert asyncio.run(run()) == [(("a", 0, 0), ("receive", "addr", 1.5, 100), True)]